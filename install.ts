@@ -15,6 +15,8 @@ const BANNER =
 
 const IGNORE_PATTERNS = ["node_modules", "package.json", "bun.lock", ".gitignore", ".DS_Store"];
 const OPENCODE_DIR = ".opencode";
+/** Files copied at once while installing; keeps open descriptors bounded. */
+const COPY_CONCURRENCY = 8;
 
 let scriptPath = new URL(import.meta.url).pathname;
 if (process.platform === "win32" && scriptPath.startsWith("/")) {
@@ -100,25 +102,36 @@ async function copyDir(
   await fs.mkdir(dest, { recursive: true });
 
   const entries = await fs.readdir(src, { withFileTypes: true });
+  const files: string[] = [];
 
   for (const entry of entries) {
     if (shouldIgnore(entry.name)) {
       continue;
     }
 
-    const srcPath = path.join(src, entry.name);
-    const destPath = path.join(dest, entry.name);
-
     if (entry.isDirectory()) {
-      await copyDir(srcPath, destPath, total, progress);
+      await copyDir(path.join(src, entry.name), path.join(dest, entry.name), total, progress);
     } else if (entry.isFile()) {
-      await fs.copyFile(srcPath, destPath);
+      files.push(entry.name);
+    }
+  }
+
+  // Files of one directory are independent, so a few copies run at once
+  // instead of waiting on each open/write/close in turn. Subdirectories are
+  // walked one at a time, so at most COPY_CONCURRENCY copies are ever open.
+  let next = 0;
+  const copyNext = async (): Promise<void> => {
+    while (next < files.length) {
+      const name = files[next++];
+      // Reflink where the filesystem supports it; otherwise a kernel-side copy.
+      await fs.copyFile(path.join(src, name), path.join(dest, name), fs.constants.COPYFILE_FICLONE);
       progress.current += 1;
       if (total > 0) {
         updateProgress(progress.current, total);
       }
     }
-  }
+  };
+  await Promise.all(Array.from({ length: Math.min(COPY_CONCURRENCY, files.length) }, copyNext));
 }
 
 async function validateSource(): Promise<boolean> {
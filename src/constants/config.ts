@@ -18,6 +18,7 @@ export const CONFIG = {
     CHUNK_SIZE: 50000,
     MAX_CONCURRENT: 5,
     RECURSION_DEPTH: 3,
+    CHUNK_CACHE_SIZE: 4,
   },
   POSITION: {
     START_WEIGHT: 1.0,
@@ -27,10 +28,14 @@ export const CONFIG = {
   },
   OPENSAGE: {
     TASK_HISTORY_LIMIT: 10,
+    MAX_TASK_RECORDS: 1000,
+    TASK_RECORD_SLACK: 100,
     MIN_MULTI_STEP_LENGTH: 100,
     COST_MULTIPLIER: 0.01,
     BASE_LATENCY_MS: 5000,
     ENSEMBLE_LATENCY_MS: 8000,
+    METRICS_FLUSH_MS: 1000,
+    MAX_EVENT_NODES: 200,
   },
 } as const;
 
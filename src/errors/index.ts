@@ -51,6 +51,16 @@ export class RLMError extends TachikomaError {
   }
 }
 
+/**
+ * An edit format could not locate its target. Another format may still
+ * succeed, so layered matching treats this as retryable.
+ */
+export class EditMatchError extends TachikomaError {
+  constructor(message: string, details?: unknown) {
+    super("EDIT_MATCH_ERROR", message, details);
+  }
+}
+
 /**
  * Type guard for Error instances
  */
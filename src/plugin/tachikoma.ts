@@ -36,56 +36,69 @@ function getScriptsDir(): string {
   return path.join(getPluginDir(), "tachikoma");
 }
 
+/**
+ * First line of the first JSDoc block, found with plain string scans
+ */
+function extractDescription(content: string): string | null {
+  const start = content.indexOf("/**");
+  if (start === -1) return null;
+  const end = content.indexOf("*/", start + 3);
+  if (end === -1) return null;
+
+  for (const rawLine of content.slice(start + 3, end).split("\n")) {
+    let line = rawLine.trim();
+    if (line.startsWith("*")) line = line.slice(1).trim();
+    if (line) return line;
+  }
+  return "";
+}
+
+async function readScriptInfo(scriptsDir: string, file: string): Promise<ScriptInfo | null> {
+  const scriptPath = path.join(scriptsDir, file);
+  const scriptName = file.replace(".ts", "");
+
+  const scriptFile = Bun.file(scriptPath);
+
+  // Check if script is a standalone script (has shebang)
+  // Agent modules don't have shebangs
+  // Skip agent modules (core.ts, router.ts, etc.) after reading only their first two bytes
+  const isScript = (await scriptFile.slice(0, 2).text()) === "#!";
+
+  if (!isScript) {
+    return null;
+  }
+
+  const scriptContent = await scriptFile.text();
+
+  const description = extractDescription(scriptContent) ?? `Run ${scriptName} script`;
+
+  const hasPathArg =
+    scriptContent.includes("Bun.argv[2]") ||
+    scriptContent.includes("process.argv[2]") ||
+    scriptContent.includes("args.path");
+
+  return {
+    name: scriptName,
+    path: scriptPath,
+    description,
+    hasPathArg,
+  };
+}
+
 async function listScripts(): Promise<ScriptInfo[]> {
   const scriptsDir = getScriptsDir();
-  const scripts: ScriptInfo[] = [];
 
   try {
     const files = await fs.readdir(scriptsDir);
+    const candidates = files.filter((file) => file.endsWith(".ts") && !file.startsWith("_"));
 
-    for (const file of files) {
-      if (!file.endsWith(".ts") || file.startsWith("_")) continue;
-
-      const scriptPath = path.join(scriptsDir, file);
-      const scriptName = file.replace(".ts", "");
-
-      const scriptContent = await fs.readFile(scriptPath, "utf-8");
-      const descMatch = scriptContent.match(/\/\*\*[\s\S]*?\*\//);
-      const description = descMatch
-        ? descMatch[0]
-            .replace(/\/\*\*|\*\//g, "")
-            .trim()
-            .replace(/^\s*\* /gm, "")
-            .trim()
-            .split("\n")[0]
-        : `Run ${scriptName} script`;
-
-      // Check if script is a standalone script (has shebang)
-      // Agent modules don't have shebangs
-      // Skip agent modules (core.ts, router.ts, etc.)
-      const isScript = scriptContent.startsWith("#!");
-
-      if (!isScript) {
-        continue;
-      }
-
-      const hasPathArg =
-        scriptContent.includes("Bun.argv[2]") ||
-        scriptContent.includes("process.argv[2]") ||
-        scriptContent.includes("args.path");
-
-      scripts.push({
-        name: scriptName,
-        path: scriptPath,
-        description,
-        hasPathArg,
-      });
-    }
+    // Read scripts concurrently; results keep directory order
+    const infos = await Promise.all(candidates.map((file) => readScriptInfo(scriptsDir, file)));
+    return infos.filter((info): info is ScriptInfo => info !== null);
   } catch (error) {
     console.error(`Error listing scripts: ${error}`);
+    return [];
   }
-
-  return scripts;
 }
 
 function getSchema(script: ScriptInfo) {
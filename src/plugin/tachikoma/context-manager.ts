@@ -1,20 +1,46 @@
-import { existsSync } from "node:fs";
-import { readdir } from "node:fs/promises";
+import { opendir, readFile, stat } from "node:fs/promises";
 import { dirname, join } from "node:path";
 
 import { CONFIG } from "../../constants/config";
 import { TOKEN_ESTIMATION } from "../../constants/tokenization";
-import { readTextFileSafe } from "../../utils/file-utils";
 import { logger } from "../../utils/logger";
 import {
   getConfigPath,
   resolveContextModulePath,
   resolveToConfig,
 } from "../../utils/platform-paths";
-import { estimateTokens } from "../../utils/token-estimator";
+import { countWordsAndCodeChars, estimateTokens } from "../../utils/token-estimator";
 
 export type Priority = "critical" | "high" | "medium" | "low";
 
+const PRIORITY_MARKER = /<!--\s*priority:\s*(critical|high|medium|low)\s*-->/i;
+
+interface CachedText {
+  mtimeMs: number;
+  size: number;
+  content: string;
+}
+
+/** AGENTS.md and module contents keyed by path, valid while mtime and size match. */
+const textCache = new Map<string, CachedText>();
+
+/** Read a file through the cache; null when it is missing or unreadable. */
+async function readTextCached(path: string): Promise<string | null> {
+  try {
+    const { mtimeMs, size } = await stat(path);
+    const cached = textCache.get(path);
+    if (cached && cached.mtimeMs === mtimeMs && cached.size === size) {
+      return cached.content;
+    }
+
+    const content = await readFile(path, "utf-8");
+    textCache.set(path, { mtimeMs, size, content });
+    return content;
+  } catch {
+    return null;
+  }
+}
+
 export interface ContextSource {
   type: "agents" | "module" | "file" | "injected";
   path: string;
@@ -66,13 +92,6 @@ const POSITION_CONFIG: PositionConfig = {
   maxMiddleRatio: CONFIG.POSITION.MAX_MIDDLE_RATIO,
 };
 
-const PRIORITY_ORDER: Record<Priority, number> = {
-  critical: 0,
-  high: 1,
-  medium: 2,
-  low: 3,
-};
-
 export class PositionAwareContext {
   private maxTokens: number;
   private compressionThreshold: number;
@@ -184,11 +203,9 @@ export class PositionAwareContext {
     }
 
     for (const candidate of candidates) {
-      if (existsSync(candidate)) {
-        const content = await readTextFileSafe(candidate, "");
-        if (content) {
-          return content.trim();
-        }
+      const content = await readTextCached(candidate);
+      if (content) {
+        return content.trim();
       }
     }
 
@@ -206,18 +223,16 @@ export class PositionAwareContext {
     const modulePaths = resolveContextModulePath(name, cwd);
 
     for (const modulePath of modulePaths) {
-      if (existsSync(modulePath)) {
-        const content = await readTextFileSafe(modulePath, "");
-        if (content) {
-          const priority = this.extractPriority(content);
-
-          return {
-            name,
-            path: modulePath,
-            content: content.trim(),
-            priority,
-          };
-        }
+      const content = await readTextCached(modulePath);
+      if (content) {
+        const priority = this.extractPriority(content);
+
+        return {
+          name,
+          path: modulePath,
+          content: content.trim(),
+          priority,
+        };
       }
     }
 
@@ -236,18 +251,17 @@ export class PositionAwareContext {
     if (sources.length === 0) return "";
     if (sources.length === 1) return sources[0].content;
 
-    // Sort by priority
-    const sorted = [...sources].sort(
-      (a, b) => PRIORITY_ORDER[a.priority] - PRIORITY_ORDER[b.priority],
-    );
-
     const sections: string[] = [];
 
-    // Group by priority
-    const critical = sorted.filter((s) => s.priority === "critical");
-    const high = sorted.filter((s) => s.priority === "high");
-    const medium = sorted.filter((s) => s.priority === "medium");
-    const low = sorted.filter((s) => s.priority === "low");
+    // Group by priority in one pass; each bucket keeps the input order
+    const critical: ContextSource[] = [];
+    const high: ContextSource[] = [];
+    const medium: ContextSource[] = [];
+    const low: ContextSource[] = [];
+    const buckets: Record<Priority, ContextSource[]> = { critical, high, medium, low };
+    for (const source of sources) {
+      buckets[source.priority].push(source);
+    }
 
     // START: Critical content (100% weight)
     if (critical.length > 0) {
@@ -358,7 +372,7 @@ export class PositionAwareContext {
   }
 
   private extractPriority(content: string): Priority {
-    const match = content.match(/<!--\s*priority:\s*(critical|high|medium|low)\s*-->/i);
+    const match = content.match(PRIORITY_MARKER);
     if (match) {
       return match[1].toLowerCase() as Priority;
     }
@@ -375,14 +389,12 @@ export class PositionAwareContext {
   estimateTokens(text: string): number {
     if (!text) return 0;
 
-    // Count words (split by whitespace)
-    const words = text.split(/\s+/).filter(Boolean).length;
-
-    // Count code-like patterns (functions, brackets, etc add tokens)
-    const codePatterns = (text.match(/[{}\[\]()<>:=;,.]/g) || []).length;
+    // Count words (split by whitespace) and code-like patterns (functions,
+    // brackets, etc add tokens) in a single pass
+    const { words, codeChars } = countWordsAndCodeChars(text);
 
     const naturalTokens = Math.ceil(words / TOKEN_ESTIMATION.WORDS_PER_TOKEN_NATURAL);
-    const codeTokens = Math.ceil(codePatterns * TOKEN_ESTIMATION.CODE_PATTERN_TOKEN_MULTIPLIER);
+    const codeTokens = Math.ceil(codeChars * TOKEN_ESTIMATION.CODE_PATTERN_TOKEN_MULTIPLIER);
 
     return naturalTokens + codeTokens;
   }
@@ -420,17 +432,16 @@ export class PositionAwareContext {
     const modules: Set<string> = new Set();
 
     for (const dir of moduleDirs) {
-      if (existsSync(dir)) {
-        try {
-          const files = await readdir(dir);
-          for (const file of files) {
-            if (file.endsWith(".md")) {
-              modules.add(file.replace(".md", ""));
-            }
+      try {
+        // Stream dirents instead of materialising the listing; their types come
+        // from the directory read itself, so no per-entry stat is needed.
+        for await (const entry of await opendir(dir)) {
+          if (!entry.isDirectory() && entry.name.endsWith(".md")) {
+            modules.add(entry.name.slice(0, -".md".length));
           }
-        } catch {
-          continue;
         }
+      } catch {
+        // Missing or unreadable directory
       }
     }
 
@@ -1,3 +1,4 @@
+import type { ExecutionStrategy } from "../../types/router";
 import { logger } from "../../utils/logger";
 import { PositionAwareContext } from "./context-manager";
 import { ModelHarness } from "./model-harness";
@@ -5,6 +6,13 @@ import { RLMHandler } from "./rlm-handler";
 import { CostAwareRouter } from "./router";
 import { VerificationLoop } from "./verifier";
 
+type StrategyHandler = (
+  request: string,
+  optimizedContext: string,
+  model: string,
+  editFormat: string,
+) => Promise<string>;
+
 export class GeneralPurposeAgent {
   private router: CostAwareRouter;
   private verifier: VerificationLoop;
@@ -12,6 +20,19 @@ export class GeneralPurposeAgent {
   private modelHarness: ModelHarness;
   private rlmHandler: RLMHandler;
   private initialized = false;
+  /** Shared by concurrent initialize() calls so the router is set up once. */
+  private initializing: Promise<void> | null = null;
+
+  private readonly strategyHandlers: Record<ExecutionStrategy, StrategyHandler> = {
+    direct: (request, _context, model, editFormat) =>
+      this.executeDirect(request, model, editFormat),
+    single_skill: (request, _context, model, editFormat) =>
+      this.executeWithSkill(request, model, editFormat),
+    skill_chain: (request, _context, model, editFormat) =>
+      this.executeSkillChain(request, model, editFormat),
+    rlm: (request, context, model, editFormat) =>
+      this.executeWithRLM(request, context, model, editFormat),
+  };
 
   constructor() {
     this.router = new CostAwareRouter();
@@ -21,10 +42,17 @@ export class GeneralPurposeAgent {
     this.rlmHandler = new RLMHandler();
   }
 
-  async initialize(): Promise<void> {
-    if (this.initialized) return;
-    await this.router.initialize();
-    this.initialized = true;
+  initialize(): Promise<void> {
+    this.initializing ??= this.router.initialize().then(
+      () => {
+        this.initialized = true;
+      },
+      (error) => {
+        this.initializing = null;
+        throw error;
+      },
+    );
+    return this.initializing;
   }
 
   private ensureInitialized(): void {
@@ -53,24 +81,11 @@ export class GeneralPurposeAgent {
       const editFormat = selection.format;
 
       // Step 4: Execute with verification
-      let result: string;
-
-      switch (strategy) {
-        case "direct":
-          result = await this.executeDirect(request, model, editFormat);
-          break;
-        case "single_skill":
-          result = await this.executeWithSkill(request, model, editFormat);
-          break;
-        case "skill_chain":
-          result = await this.executeSkillChain(request, model, editFormat);
-          break;
-        case "rlm":
-          result = await this.executeWithRLM(request, contextData.optimized, model, editFormat);
-          break;
-        default:
-          throw new Error(`Unknown strategy: ${strategy}`);
+      const handler = this.strategyHandlers[strategy];
+      if (!handler) {
+        throw new Error(`Unknown strategy: ${strategy}`);
       }
+      let result = await handler(request, contextData.optimized, model, editFormat);
 
       // Step 5: Verify and revise
       const verificationResult = await this.verifier.verifyAndRevise(request, result);
@@ -15,16 +15,17 @@
  * Formats: str_replace, str_replace_fuzzy, apply_patch, hashline
  */
 
-import { existsSync } from "node:fs";
+import { stat } from "node:fs/promises";
 
 import type { EditFormat } from "../../constants/edit-formats";
 import { MODEL_ENV_VARS } from "../../constants/model-env";
 import { cliLogger } from "../../utils/cli-logger";
 import { resolveToConfig } from "../../utils/path";
+import { escapeRegExp } from "../../utils/string-utils";
 import { parseSimpleYaml } from "../../utils/yaml-parser";
 
 // TYPES
-interface FormatConfig {
+export interface FormatConfig {
   formats: Record<string, EditFormat>;
 }
 
@@ -39,23 +40,29 @@ interface FormatRecommendation {
 const CONFIG_PATH = resolveToConfig("config/edit-format-model-config.yaml");
 
 // FORMAT DESCRIPTIONS
-const FORMAT_INFO: Record<EditFormat, string> = {
+const FORMAT_INFO: Readonly<Record<EditFormat, string>> = Object.freeze({
   str_replace: "Exact string matching (Claude, Mistral)",
   str_replace_fuzzy: "Fuzzy whitespace matching (Gemini)",
   apply_patch: "OpenAI-style diff format (GPT)",
   hashline: "Content-hash anchoring (Grok, GLM, others)",
   editblock: "Aider-style search/replace (Most models)",
-};
+});
+
+const FORMAT_NAMES: ReadonlySet<string> = new Set(Object.keys(FORMAT_INFO));
 
 // CONFIGURATION
-async function loadConfig(): Promise<FormatConfig> {
-  if (!existsSync(CONFIG_PATH)) {
-    return { formats: {} };
-  }
+interface CachedConfig {
+  mtimeMs: number;
+  size: number;
+  config: FormatConfig;
+}
 
+/** Last config read from CONFIG_PATH, reused while its mtime and size match. */
+let cachedConfig: CachedConfig | null = null;
+
+async function readConfig(): Promise<FormatConfig> {
   try {
-    const content = await Bun.file(CONFIG_PATH).text();
-    const parsed = parseSimpleYaml(content);
+    const parsed = parseSimpleYaml(await Bun.file(CONFIG_PATH).text());
     return {
       formats: (parsed.formats || {}) as Record<string, EditFormat>,
     };
@@ -64,8 +71,28 @@ async function loadConfig(): Promise<FormatConfig> {
   }
 }
 
+/**
+ * Load the format config, returning the same object until the file changes so
+ * the matcher built for it is reused. Callers must not mutate the result.
+ */
+async function loadConfig(): Promise<FormatConfig> {
+  let mtimeMs: number;
+  let size: number;
+  try {
+    ({ mtimeMs, size } = await stat(CONFIG_PATH));
+  } catch {
+    cachedConfig = null;
+    return { formats: {} };
+  }
+
+  if (!cachedConfig || cachedConfig.mtimeMs !== mtimeMs || cachedConfig.size !== size) {
+    cachedConfig = { mtimeMs, size, config: await readConfig() };
+  }
+  return cachedConfig.config;
+}
+
 function isValidFormat(value: string): value is EditFormat {
-  return ["str_replace", "str_replace_fuzzy", "apply_patch", "hashline"].includes(value);
+  return FORMAT_NAMES.has(value);
 }
 
 async function saveConfig(config: FormatConfig): Promise<void> {
@@ -101,23 +128,61 @@ function detectModel(): string {
 }
 
 // FORMAT SELECTION
-function findFormatMatch(model: string, config: FormatConfig): EditFormat | null {
+interface FormatMatcher {
+  pattern: RegExp | null;
+  formats: Map<string, EditFormat>;
+}
+
+const formatMatchers = new WeakMap<FormatConfig, FormatMatcher>();
+
+/**
+ * One alternation over all configured model patterns, built once per config.
+ * Each alternative sits in a lookahead so a global scan reports every pattern
+ * contained in the model, overlapping ones included.
+ */
+function getFormatMatcher(config: FormatConfig): FormatMatcher {
+  let matcher = formatMatchers.get(config);
+  if (!matcher) {
+    const formats = new Map<string, EditFormat>();
+    for (const [pattern, format] of Object.entries(config.formats)) {
+      const key = pattern.toLowerCase();
+      if (key && !formats.has(key)) formats.set(key, format);
+    }
+    const alternatives = Array.from(formats.keys())
+      .sort((a, b) => b.length - a.length)
+      .map(escapeRegExp)
+      .join("|");
+    matcher = {
+      pattern: alternatives ? new RegExp(`(?=(${alternatives}))`, "g") : null,
+      formats,
+    };
+    formatMatchers.set(config, matcher);
+  }
+  return matcher;
+}
+
+/**
+ * Resolve a model to its edit format: an exact key wins, otherwise the longest
+ * configured pattern contained in the model name (leftmost on a tie).
+ */
+export function findFormatMatch(model: string, config: FormatConfig): EditFormat | null {
   const modelLower = model.toLowerCase();
 
-  if (modelLower in config.formats) {
+  if (Object.hasOwn(config.formats, modelLower)) {
     return config.formats[modelLower];
   }
 
-  for (const [pattern, format] of Object.entries(config.formats)) {
-    if (modelLower.includes(pattern.toLowerCase())) {
-      return format;
-    }
-  }
+  const { pattern, formats } = getFormatMatcher(config);
+  if (!pattern) return null;
 
-  return null;
+  let longest = "";
+  for (const match of modelLower.matchAll(pattern)) {
+    if (match[1].length > longest.length) longest = match[1];
+  }
+  return longest ? (formats.get(longest) ?? null) : null;
 }
 
-function selectFormat(model: string, config: FormatConfig): FormatRecommendation {
+export function selectFormat(model: string, config: FormatConfig): FormatRecommendation {
   const matched = findFormatMatch(model, config);
 
   if (matched) {
@@ -148,26 +213,33 @@ function formatRecommendation(rec: FormatRecommendation): string {
   ].join("\n");
 }
 
-function printFormats(): void {
-  cliLogger.info("Available formats:");
+function formatList(): string {
+  const lines = ["Available formats:"];
   for (const [fmt, desc] of Object.entries(FORMAT_INFO)) {
-    cliLogger.info(`  ${fmt.padEnd(20)} ${desc}`);
+    lines.push(`  ${fmt.padEnd(20)} ${desc}`);
   }
+  return lines.join("\n");
 }
 
+const VALID_FORMATS_LINE = [...FORMAT_NAMES].join(", ");
+
+const USAGE = [
+  "Edit Format Selector - Functional Model-Aware Editing",
+  "",
+  "Usage:",
+  "  bun run edit-format-selector.ts <command> [args]",
+  "",
+  "Commands:",
+  "  detect              Auto-detect current model",
+  "  recommend           Get format recommendation",
+  "  add <model> <fmt> Add model->format mapping",
+  "  list                List all formats",
+  "",
+  `Formats: ${VALID_FORMATS_LINE}`,
+].join("\n");
+
 function printUsage(): void {
-  cliLogger.info("Edit Format Selector - Functional Model-Aware Editing");
-  cliLogger.info("");
-  cliLogger.info("Usage:");
-  cliLogger.info("  bun run edit-format-selector.ts <command> [args]");
-  cliLogger.info("");
-  cliLogger.info("Commands:");
-  cliLogger.info("  detect              Auto-detect current model");
-  cliLogger.info("  recommend           Get format recommendation");
-  cliLogger.info("  add <model> <fmt> Add model->format mapping");
-  cliLogger.info("  list                List all formats");
-  cliLogger.info("");
-  cliLogger.info("Formats: str_replace, str_replace_fuzzy, apply_patch, hashline");
+  cliLogger.info(USAGE);
 }
 
 // MAIN
@@ -180,8 +252,7 @@ async function handleRecommend(): Promise<void> {
   const config = await loadConfig();
   const model = detectModel();
   const recommendation = selectFormat(model, config);
-  cliLogger.info("");
-  cliLogger.info(formatRecommendation(recommendation));
+  cliLogger.info(`\n${formatRecommendation(recommendation)}`);
 }
 
 async function handleAdd(args: string[]): Promise<void> {
@@ -193,28 +264,32 @@ async function handleAdd(args: string[]): Promise<void> {
   const [model, format] = args;
 
   if (!isValidFormat(format)) {
-    cliLogger.error(`Invalid format: ${format}`);
-    cliLogger.error("Valid formats: str_replace, str_replace_fuzzy, apply_patch, hashline");
+    cliLogger.error(`Invalid format: ${format}\nValid formats: ${VALID_FORMATS_LINE}`);
     process.exit(1);
   }
 
-  const config = await loadConfig();
-  config.formats[model.toLowerCase()] = format as EditFormat;
-  await saveConfig(config);
+  const { formats } = await loadConfig();
+  await saveConfig({ formats: { ...formats, [model.toLowerCase()]: format } });
   cliLogger.info(`Added: ${model} -> ${format}`);
 }
 
 async function handleList(): Promise<void> {
-  cliLogger.info("Current format mappings:");
-  cliLogger.info("");
   const config = await loadConfig();
+  const lines = ["Current format mappings:", ""];
   for (const [model, format] of Object.entries(config.formats)) {
-    cliLogger.info(`  ${model.padEnd(25)} ${format}`);
+    lines.push(`  ${model.padEnd(25)} ${format}`);
   }
-  cliLogger.info("");
-  printFormats();
+  lines.push("", formatList());
+  cliLogger.info(lines.join("\n"));
 }
 
+const COMMANDS: ReadonlyMap<string, (args: string[]) => Promise<void>> = new Map([
+  ["detect", handleDetect],
+  ["recommend", handleRecommend],
+  ["add", handleAdd],
+  ["list", handleList],
+]);
+
 async function main(): Promise<void> {
   const args = process.argv.slice(2);
 
@@ -223,18 +298,11 @@ async function main(): Promise<void> {
     return;
   }
 
-  const command = args[0];
-  const commandArgs = args.slice(1);
+  const [command, ...commandArgs] = args;
+  const handler = COMMANDS.get(command);
 
-  const handlers: Record<string, () => Promise<void>> = {
-    detect: handleDetect,
-    recommend: handleRecommend,
-    add: () => handleAdd(commandArgs),
-    list: handleList,
-  };
-
-  if (handlers[command]) {
-    await handlers[command]();
+  if (handler) {
+    await handler(commandArgs);
   } else {
     cliLogger.error(`Unknown command: ${command}`);
     printUsage();
@@ -242,7 +310,9 @@ async function main(): Promise<void> {
   }
 }
 
-main().catch((err) => {
-  cliLogger.error("Error:", err);
-  process.exit(1);
-});
+if (import.meta.main) {
+  main().catch((err) => {
+    cliLogger.error("Error:", err);
+    process.exit(1);
+  });
+}
@@ -1,10 +1,10 @@
-import { existsSync } from "node:fs";
 import { join } from "node:path";
 
 import type { EditFormat, ModelFamily } from "../../constants/edit-formats";
 import { MODEL_CONFIDENCE } from "../../constants/model-confidence";
 import { MODEL_ENV_VARS } from "../../constants/model-env";
 import { MATCH_THRESHOLD } from "../../constants/tokenization";
+import { EditMatchError } from "../../errors";
 import type { EditChange, EditResult, ModelSelection } from "../../types/common";
 import { logger } from "../../utils/logger";
 import { resolveToConfig } from "../../utils/platform-paths";
@@ -12,8 +12,22 @@ import { parseSimpleYaml } from "../../utils/yaml-parser";
 
 export type { EditFormat, ModelFamily };
 
+/** Checked in order; the first family whose pattern matches wins. */
+const MODEL_FAMILY_PATTERNS: ReadonlyArray<readonly [RegExp, ModelFamily]> = [
+  [/claude|anthropic/, "claude"],
+  [/gpt|openai/, "gpt"],
+  [/gemini|google/, "gemini"],
+  [/grok|xai/, "grok"],
+  [/glm|zhipu/, "glm"],
+  [/mistral|mixtral/, "mistral"],
+  // CodeLlama/LLaMA and Command-R share the same edit format
+  [/llama|羊驼|command-r/, "codellama"],
+];
+
 export class ModelHarness {
   private configPath: string;
+  /** Shared by concurrent lookups so the config file is read once. */
+  private familyDefaults: Promise<Record<string, string> | null> | null = null;
 
   constructor(configPath?: string) {
     this.configPath = configPath || resolveToConfig("config/edit-format-model-config.yaml");
@@ -58,44 +72,10 @@ export class ModelHarness {
   classifyModel(model: string): ModelFamily {
     const lower = model.toLowerCase();
 
-    // Claude family
-    if (lower.includes("claude") || lower.includes("anthropic")) {
-      return "claude";
-    }
-
-    // GPT/OpenAI family
-    if (lower.includes("gpt") || lower.includes("openai") || lower.includes("chatgpt")) {
-      return "gpt";
-    }
-
-    // Gemini/Google family
-    if (lower.includes("gemini") || lower.includes("google")) {
-      return "gemini";
-    }
-
-    // Grok/xAI family
-    if (lower.includes("grok") || lower.includes("xai")) {
-      return "grok";
-    }
-
-    // GLM/Zhipu AI family
-    if (lower.includes("glm") || lower.includes("zhipu")) {
-      return "glm";
-    }
-
-    // Mistral family
-    if (lower.includes("mistral") || lower.includes("mixtral")) {
-      return "mistral";
-    }
-
-    // CodeLlama/LLaMA family
-    if (lower.includes("codellama") || lower.includes("llama") || lower.includes("羊驼")) {
-      return "codellama";
-    }
-
-    // Command-R family
-    if (lower.includes("command-r")) {
-      return "codellama";
+    for (const [pattern, family] of MODEL_FAMILY_PATTERNS) {
+      if (pattern.test(lower)) {
+        return family;
+      }
     }
 
     return "generic";
@@ -109,26 +89,34 @@ export class ModelHarness {
   }
 
   private async loadConfigFormat(family: ModelFamily): Promise<EditFormat | null> {
-    if (!existsSync(this.configPath)) {
-      return null;
+    const familyDefaults = await this.loadFamilyDefaults();
+    const format = familyDefaults?.[family];
+    if (format && isValidFormat(format)) {
+      return format as EditFormat;
     }
+    return null;
+  }
 
-    try {
-      const content = await Bun.file(this.configPath).text();
-      const parsed = parseSimpleYaml(content);
+  /** Reads `family_defaults` once; later lookups hit the cached table. */
+  private loadFamilyDefaults(): Promise<Record<string, string> | null> {
+    this.familyDefaults ??= this.readFamilyDefaults();
+    return this.familyDefaults;
+  }
 
-      const familyDefaults = parsed.family_defaults as Record<string, string> | undefined;
-      if (familyDefaults) {
-        const format = familyDefaults[family];
-        if (format && isValidFormat(format)) {
-          return format as EditFormat;
-        }
+  private async readFamilyDefaults(): Promise<Record<string, string> | null> {
+    const file = Bun.file(this.configPath);
+
+    try {
+      if (!(await file.exists())) {
+        return null;
       }
+      const content = await file.text();
+      const parsed = parseSimpleYaml(content);
+      return (parsed.family_defaults as Record<string, string> | undefined) ?? null;
     } catch (error) {
-      logger.warn(`Failed to load config for model family: ${family}`, error);
+      logger.warn(`Failed to load edit format config: ${this.configPath}`, error);
+      return null;
     }
-
-    return null;
   }
 
   private getConfidence(family: ModelFamily): number {
@@ -181,20 +169,22 @@ export class ModelHarness {
         format,
         attempts: 1,
         error: error instanceof Error ? error.message : "Unknown error",
+        retryable: error instanceof EditMatchError,
       };
     }
   }
 
   layeredMatch(content: string, change: EditChange): EditResult {
-    let result = this.executeEdit(content, change, "str_replace");
-    if (result.success) return { ...result, attempts: 1 };
-
-    result = this.executeEdit(content, change, "str_replace_fuzzy");
-    if (result.success) return { ...result, attempts: 2 };
-
-    if (change.lineNumber) {
-      result = this.executeEdit(content, change, "hashline");
-      if (result.success) return { ...result, attempts: 3 };
+    const formats: EditFormat[] = change.lineNumber
+      ? ["str_replace", "str_replace_fuzzy", "hashline"]
+      : ["str_replace", "str_replace_fuzzy"];
+
+    for (let i = 0; i < formats.length; i++) {
+      const result = this.executeEdit(content, change, formats[i]);
+      // Stop early on success, or on a failure no other format can fix
+      if (result.success || !result.retryable) {
+        return { ...result, attempts: i + 1 };
+      }
     }
 
     return {
@@ -203,6 +193,7 @@ export class ModelHarness {
       format: "str_replace",
       attempts: 3,
       error: "All matching strategies failed",
+      retryable: false,
     };
   }
 
@@ -219,7 +210,7 @@ export class ModelHarness {
 
     const index = content.indexOf(oldString);
     if (index === -1) {
-      throw new Error(`Could not find: "${oldString.substring(0, 50)}..."`);
+      throw new EditMatchError(`Could not find: "${oldString.substring(0, 50)}..."`);
     }
 
     return content.slice(0, index) + newString + content.slice(index + oldString.length);
@@ -237,7 +228,13 @@ export class ModelHarness {
     const matchIndex = normalizedContent.indexOf(normalizedOld);
 
     if (matchIndex !== -1) {
-      const result = this.doFuzzyReplace(content, oldString, newString);
+      const result = this.doFuzzyReplace(
+        content,
+        newString,
+        normalizedContent,
+        normalizedOld,
+        matchIndex,
+      );
       if (result) return result;
     }
 
@@ -259,7 +256,7 @@ export class ModelHarness {
       }
     }
 
-    throw new Error(`Could not find (fuzzy): "${oldString.substring(0, 50)}..."`);
+    throw new EditMatchError(`Could not find (fuzzy): "${oldString.substring(0, 50)}..."`);
   }
 
   private normalizeForFuzzy(str: string): string {
@@ -293,21 +290,23 @@ export class ModelHarness {
     return matches >= words2.length * MATCH_THRESHOLD.FUZZY_MATCH_MIN;
   }
 
-  private doFuzzyReplace(content: string, oldString: string, newString: string): string | null {
-    const normalizedOld = this.normalizeForFuzzy(oldString);
-    const normalizedContent = this.normalizeForFuzzy(content);
-
-    const matchIndex = normalizedContent.indexOf(normalizedOld);
-    if (matchIndex === -1) return null;
-
+  /**
+   * Map a match in the normalized text back onto the original content. The
+   * caller passes the normalized strings and match index it already computed,
+   * so the whole content is normalized once per edit rather than three times.
+   */
+  private doFuzzyReplace(
+    content: string,
+    newString: string,
+    contentNorm: string,
+    targetNorm: string,
+    matchIndex: number,
+  ): string | null {
     // Find the actual substring in original content
     let charCount = 0;
     let startIndex = -1;
     let endIndex = -1;
 
-    const contentNorm = this.normalizeForFuzzy(content);
-    const targetNorm = this.normalizeForFuzzy(oldString);
-
     for (let i = 0; i < content.length; i++) {
       if (charCount === matchIndex) {
         startIndex = i;
@@ -358,7 +357,7 @@ export class ModelHarness {
     }
 
     if (startIndex === -1) {
-      throw new Error("Could not find patch location");
+      throw new EditMatchError("Could not find patch location");
     }
 
     // Replace the block
@@ -381,6 +380,9 @@ export class ModelHarness {
     lineNumber?: number,
   ): string {
     const lines = content.split("\n");
+    // The anchor side never changes, so hash and trim it once up front.
+    const oldHash = this.computeHash(oldString);
+    const oldTrimmed = oldString.trim();
 
     if (lineNumber !== undefined && lineNumber > 0 && lineNumber <= lines.length) {
       // Line-based hashline
@@ -388,27 +390,26 @@ export class ModelHarness {
       const hash = this.computeHash(lines[targetLine]);
 
       // Replace line if hash matches (integrity check)
-      if (hash === this.computeHash(oldString) || lines[targetLine].trim() === oldString.trim()) {
+      if (hash === oldHash || lines[targetLine].trim() === oldTrimmed) {
         lines[targetLine] = newString;
         return lines.join("\n");
       }
 
-      throw new Error(`Hash mismatch at line ${lineNumber} - file may have changed`);
+      throw new EditMatchError(`Hash mismatch at line ${lineNumber} - file may have changed`);
     }
 
     // Content-based hashline (find by content hash)
     for (let i = 0; i < lines.length; i++) {
       const hash = this.computeHash(lines[i]);
-      const oldHash = this.computeHash(oldString);
 
       // Check if hashes match or content matches after normalization
-      if (hash === oldHash || lines[i].trim() === oldString.trim()) {
+      if (hash === oldHash || lines[i].trim() === oldTrimmed) {
         lines[i] = newString;
         return lines.join("\n");
       }
     }
 
-    throw new Error("Could not find content for hashline edit");
+    throw new EditMatchError("Could not find content for hashline edit");
   }
 
   /**
@@ -439,7 +440,7 @@ export class ModelHarness {
         }
       }
 
-      throw new Error("Could not find editblock location");
+      throw new EditMatchError("Could not find editblock location");
     }
 
     return content.slice(0, index) + newString + content.slice(index + trimmedOld.length);
@@ -486,8 +487,8 @@ export const formatPriorities = [
 
 // VALIDATION
 
+const FORMAT_NAMES: ReadonlySet<string> = new Set(formatPriorities);
+
 function isValidFormat(value: string): boolean {
-  return ["str_replace", "str_replace_fuzzy", "apply_patch", "hashline", "editblock"].includes(
-    value,
-  );
+  return FORMAT_NAMES.has(value);
 }
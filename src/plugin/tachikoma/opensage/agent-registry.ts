@@ -1,7 +1,9 @@
-import { mkdir, writeFile } from "node:fs/promises";
+import { mkdir } from "node:fs/promises";
 import { join } from "node:path";
 import { z } from "zod";
+import { CONFIG } from "../../../constants/config";
 import type { AgentMetrics, PerformanceStats, TaskRecord } from "../../../types/opensage-registry";
+import { writeFileAtomic } from "../../../utils/file-utils";
 
 async function ensureDir(path: string): Promise<void> {
   try {
@@ -42,13 +44,53 @@ const METRICS_SCHEMA = z.object({
 
 type MetricsData = z.infer<typeof METRICS_SCHEMA>;
 
+function computeStats(agent: AgentMetrics): PerformanceStats {
+  const totalTasks = agent.successCount + agent.failureCount;
+  return {
+    successRate: totalTasks > 0 ? agent.successCount / totalTasks : 0,
+    avgCost: totalTasks > 0 ? agent.totalCost / totalTasks : 0,
+    avgLatency: agent.avgLatency,
+    totalTasks,
+  };
+}
+
+function agentKey(agentName: string, taskType: string): string {
+  return `${agentName}\0${taskType}`;
+}
+
 export class AgentRegistry {
   private metricsFile: string;
   private data: MetricsData;
+  /** Agents by name and task type; mirrors `data.agents`. */
+  private agentIndex = new Map<string, AgentMetrics>();
+  private saveTimer: ReturnType<typeof setTimeout> | null = null;
+  private readonly flushInBackground = () => {
+    this.flush().catch((error) => console.error("Failed to save agent metrics", error));
+  };
 
   constructor(worktree: string, initialData?: MetricsData) {
     this.metricsFile = join(worktree, ".opencode", "agent-metrics.json");
     this.data = initialData || { agents: [], tasks: [] };
+    this.trimTasks();
+    this.rebuildAgentIndex();
+  }
+
+  private rebuildAgentIndex(): void {
+    this.agentIndex.clear();
+    for (const agent of this.data.agents) {
+      const key = agentKey(agent.name, agent.taskType);
+      // Keep the first entry, matching what a linear find() would return.
+      if (!this.agentIndex.has(key)) this.agentIndex.set(key, agent);
+    }
+  }
+
+  private findAgent(agentName: string, taskType: string): AgentMetrics | undefined {
+    return this.agentIndex.get(agentKey(agentName, taskType));
+  }
+
+  private addAgent(agent: AgentMetrics): void {
+    this.data.agents.push(agent);
+    this.agentIndex.set(agentKey(agent.name, agent.taskType), agent);
   }
 
   static async create(worktree: string): Promise<AgentRegistry> {
@@ -60,8 +102,7 @@ export class AgentRegistry {
     }
 
     try {
-      const content = await file.text();
-      const data = METRICS_SCHEMA.parse(JSON.parse(content));
+      const data = METRICS_SCHEMA.parse(await file.json());
       return new AgentRegistry(worktree, data);
     } catch (error) {
       console.error("Failed to load metrics, using empty state", error);
@@ -75,8 +116,7 @@ export class AgentRegistry {
       return { agents: [], tasks: [] };
     }
     try {
-      const content = await file.text();
-      return METRICS_SCHEMA.parse(JSON.parse(content));
+      return METRICS_SCHEMA.parse(await file.json());
     } catch (error) {
       console.error("Failed to load metrics, using empty state", error);
       return { agents: [], tasks: [] };
@@ -84,8 +124,58 @@ export class AgentRegistry {
   }
 
   async saveMetrics(): Promise<void> {
+    this.cancelScheduledSave();
+    this.trimTasks();
     await ensureDir(join(this.metricsFile, ".."));
-    await writeFile(this.metricsFile, JSON.stringify(this.data, null, 2));
+    await writeFileAtomic(this.metricsFile, JSON.stringify(this.data));
+  }
+
+  /**
+   * Write any buffered changes now. Successes are batched behind a short
+   * timer; failures and process exit flush immediately.
+   */
+  async flush(): Promise<void> {
+    if (this.saveTimer) {
+      await this.saveMetrics();
+    }
+  }
+
+  private scheduleSave(): void {
+    if (this.saveTimer) return;
+
+    this.saveTimer = setTimeout(this.flushInBackground, CONFIG.OPENSAGE.METRICS_FLUSH_MS);
+    this.saveTimer.unref?.();
+    process.once("beforeExit", this.flushInBackground);
+  }
+
+  private cancelScheduledSave(): void {
+    if (!this.saveTimer) return;
+
+    clearTimeout(this.saveTimer);
+    this.saveTimer = null;
+    process.off("beforeExit", this.flushInBackground);
+  }
+
+  /**
+   * Task history is a bounded window; the oldest records fall off first. In
+   * memory it may run up to TASK_RECORD_SLACK past the limit so the front of
+   * the array is spliced once per batch, not on every append once full.
+   */
+  private appendTask(record: TaskRecord): void {
+    this.data.tasks.push(record);
+    if (
+      this.data.tasks.length >
+      CONFIG.OPENSAGE.MAX_TASK_RECORDS + CONFIG.OPENSAGE.TASK_RECORD_SLACK
+    ) {
+      this.trimTasks();
+    }
+  }
+
+  private trimTasks(): void {
+    const overflow = this.data.tasks.length - CONFIG.OPENSAGE.MAX_TASK_RECORDS;
+    if (overflow > 0) {
+      this.data.tasks.splice(0, overflow);
+    }
   }
 
   async recordSuccess(
@@ -95,39 +185,41 @@ export class AgentRegistry {
     latency: number,
     taskId?: string,
   ): Promise<void> {
-    const agent = this.data.agents.find((a) => a.name === agentName && a.taskType === taskType);
+    const agent = this.findAgent(agentName, taskType);
+    const now = Date.now();
+    const lastUsed = new Date(now).toISOString();
 
     if (agent) {
       agent.successCount++;
       agent.totalCost += cost;
       agent.avgLatency =
         (agent.avgLatency * (agent.successCount - 1) + latency) / agent.successCount;
-      agent.lastUsed = new Date().toISOString();
+      agent.lastUsed = lastUsed;
     } else {
-      this.data.agents.push({
+      this.addAgent({
         name: agentName,
         taskType,
         successCount: 1,
         failureCount: 0,
         totalCost: cost,
         avgLatency: latency,
-        lastUsed: new Date().toISOString(),
+        lastUsed,
       });
     }
 
     if (taskId) {
-      this.data.tasks.push({
+      this.appendTask({
         taskId,
         agentName,
         taskType,
-        timestamp: Date.now(),
+        timestamp: now,
         duration: latency,
         cost,
         success: true,
       });
     }
 
-    await this.saveMetrics();
+    this.scheduleSave();
   }
 
   async recordFailure(
@@ -136,29 +228,31 @@ export class AgentRegistry {
     error: string,
     taskId?: string,
   ): Promise<void> {
-    const agent = this.data.agents.find((a) => a.name === agentName && a.taskType === taskType);
+    const agent = this.findAgent(agentName, taskType);
+    const now = Date.now();
+    const lastUsed = new Date(now).toISOString();
 
     if (agent) {
       agent.failureCount++;
-      agent.lastUsed = new Date().toISOString();
+      agent.lastUsed = lastUsed;
     } else {
-      this.data.agents.push({
+      this.addAgent({
         name: agentName,
         taskType,
         successCount: 0,
         failureCount: 1,
         totalCost: 0,
         avgLatency: 0,
-        lastUsed: new Date().toISOString(),
+        lastUsed,
       });
     }
 
     if (taskId) {
-      this.data.tasks.push({
+      this.appendTask({
         taskId,
         agentName,
         taskType,
-        timestamp: Date.now(),
+        timestamp: now,
         duration: 0,
         cost: 0,
         success: false,
@@ -170,11 +264,7 @@ export class AgentRegistry {
   }
 
   async recordTask(record: TaskRecord): Promise<void> {
-    this.data.tasks.push(record);
-
-    const agent = this.data.agents.find(
-      (a) => a.name === record.agentName && a.taskType === record.taskType,
-    );
+    this.appendTask(record);
 
     if (record.success) {
       await this.recordSuccess(record.agentName, record.taskType, record.cost, record.duration);
@@ -189,48 +279,46 @@ export class AgentRegistry {
   }
 
   getStats(agentName: string, taskType: string): PerformanceStats | null {
-    const agent = this.data.agents.find((a) => a.name === agentName && a.taskType === taskType);
+    const agent = this.findAgent(agentName, taskType);
 
-    if (!agent) return null;
-
-    const totalTasks = agent.successCount + agent.failureCount;
-    return {
-      successRate: totalTasks > 0 ? agent.successCount / totalTasks : 0,
-      avgCost: totalTasks > 0 ? agent.totalCost / totalTasks : 0,
-      avgLatency: agent.avgLatency,
-      totalTasks,
-    };
+    return agent ? computeStats(agent) : null;
   }
 
   recommendAgent(taskType: string, criteria: "success" | "cost" | "latency"): string | null {
-    const candidates = this.data.agents.filter((a) => a.taskType === taskType);
-
-    if (candidates.length === 0) return null;
-
-    const stats = candidates.map((agent) => ({
-      agent,
-      stats: this.getStats(agent.name, taskType)!,
-    }));
-
-    const best = stats.sort((a, b) => {
-      switch (criteria) {
-        case "success":
-          return b.stats.successRate - a.stats.successRate;
-        case "cost":
-          return a.stats.avgCost - b.stats.avgCost;
-        case "latency":
-          return a.stats.avgLatency - b.stats.avgLatency;
+    let bestName: string | null = null;
+    let bestScore = Number.NEGATIVE_INFINITY;
+
+    // Single pass; scores are oriented so higher is better and the first best wins.
+    for (const agent of this.data.agents) {
+      if (agent.taskType !== taskType) continue;
+
+      const stats = computeStats(agent);
+      const score =
+        criteria === "success"
+          ? stats.successRate
+          : criteria === "cost"
+            ? -stats.avgCost
+            : -stats.avgLatency;
+
+      if (bestName === null || score > bestScore) {
+        bestName = agent.name;
+        bestScore = score;
       }
-    })[0];
+    }
 
-    return best.agent.name;
+    return bestName;
   }
 
   getTaskHistory(agentName: string, limit = 10): TaskRecord[] {
-    return this.data.tasks
-      .filter((t) => t.agentName === agentName)
-      .sort((a, b) => b.timestamp - a.timestamp)
-      .slice(0, limit);
+    // Tasks are appended as they complete, so walking backwards yields newest first.
+    const history: TaskRecord[] = [];
+    for (let i = this.data.tasks.length - 1; i >= 0 && history.length < limit; i--) {
+      const task = this.data.tasks[i];
+      if (task.agentName === agentName) {
+        history.push(task);
+      }
+    }
+    return history;
   }
 
   getAllAgents(): AgentMetrics[] {
@@ -244,6 +332,7 @@ export class AgentRegistry {
       this.data.agents = [];
       this.data.tasks = [];
     }
+    this.rebuildAgentIndex();
     await this.saveMetrics();
   }
 }
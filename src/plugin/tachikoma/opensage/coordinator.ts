@@ -6,6 +6,25 @@ import type {
 } from "../../../types/opensage";
 import { AgentRegistry } from "./agent-registry";
 
+const MULTI_STEP_KEYWORDS =
+  /implement|build|create|develop|design|refactor|migrate|optimize|multi-step|then|after|following|next|subtask/;
+const ALTERNATIVE_KEYWORDS =
+  /explore|compare|alternative|different approach|multiple ways|ensemble|parallel|several options|best approach|optimize|improve| or /;
+
+/** Task-type keywords in priority order; the first type with any hit wins. */
+const TASK_TYPE_KEYWORDS: ReadonlyArray<readonly [string, readonly string[]]> = [
+  ["testing", ["test", "verify"]],
+  ["optimization", ["optimize", "improve"]],
+  ["implementation", ["implement", "create"]],
+  ["review", ["review", "audit"]],
+  ["design", ["design", "plan"]],
+];
+const TASK_TYPE_RANK: ReadonlyMap<string, number> = new Map(
+  TASK_TYPE_KEYWORDS.flatMap(([, keywords], rank) => keywords.map((k) => [k, rank] as const)),
+);
+// Zero-width lookahead so overlapping keywords are all seen in one scan.
+const TASK_TYPE_PATTERN = new RegExp(`(?=(${[...TASK_TYPE_RANK.keys()].join("|")}))`, "g");
+
 export interface OpenSageConfig {
   worktree: string;
   enableMemory: boolean;
@@ -42,7 +61,8 @@ export class OpensageCoordinator {
   private sessionHistory: Map<string, any[]>;
   private currentDepth = 0;
   private readonly MAX_DEPTH = 10;
-  private initialized = false;
+  /** Shared by concurrent initialize() calls so only one registry is created. */
+  private initializing: Promise<void> | null = null;
 
   constructor(config: Partial<OpenSageConfig> = {}) {
     this.config = {
@@ -58,8 +78,17 @@ export class OpensageCoordinator {
     this.sessionHistory = new Map();
   }
 
-  async initialize(): Promise<void> {
-    this.registry = await AgentRegistry.create(this.config.worktree);
+  initialize(): Promise<void> {
+    this.initializing ??= AgentRegistry.create(this.config.worktree).then(
+      (registry) => {
+        this.registry = registry;
+      },
+      (error) => {
+        this.initializing = null;
+        throw error;
+      },
+    );
+    return this.initializing;
   }
 
   async planExecution(
@@ -139,44 +168,9 @@ export class OpensageCoordinator {
     hasAlternatives: boolean;
     confidence: number;
   }> {
-    const keywords = {
-      multiStep: [
-        "implement",
-        "build",
-        "create",
-        "develop",
-        "design",
-        "refactor",
-        "migrate",
-        "optimize",
-        "multi-step",
-        "then",
-        "after",
-        "following",
-        "next",
-        "subtask",
-      ],
-      alternatives: [
-        "explore",
-        "compare",
-        "alternative",
-        "different approach",
-        "multiple ways",
-        "ensemble",
-        "parallel",
-        "several options",
-        "best approach",
-        "optimize",
-        "improve",
-      ],
-    };
-
     const taskLower = task.toLowerCase();
-    const hasMultiStepKeywords = keywords.multiStep.some((k) => taskLower.includes(k));
-    const hasAlternativeKeywords = keywords.alternatives.some((k) => taskLower.includes(k));
-
-    const isMultiStep = hasMultiStepKeywords || task.length > 100;
-    const hasAlternatives = hasAlternativeKeywords || taskLower.includes(" or ");
+    const isMultiStep = MULTI_STEP_KEYWORDS.test(taskLower) || task.length > 100;
+    const hasAlternatives = ALTERNATIVE_KEYWORDS.test(taskLower);
 
     const confidence = Math.min(0.5 + (isMultiStep ? 0.3 : 0) + (hasAlternatives ? 0.2 : 0), 1.0);
 
@@ -318,12 +312,11 @@ export class OpensageCoordinator {
 
     topology.ensembleMembers.forEach((agent) => agentsUsed.push(agent.name));
 
-    const successfulResults = memberResults.filter((r) => r.success);
-    const failedResults = memberResults.filter((r) => !r.success);
-
-    failedResults.forEach((r) => {
-      errors.push(`Agent ${r.agent} failed: ${r.error}`);
-    });
+    const successfulResults: typeof memberResults = [];
+    for (const r of memberResults) {
+      if (r.success) successfulResults.push(r);
+      else errors.push(`Agent ${r.agent} failed: ${r.error}`);
+    }
 
     if (successfulResults.length === 0) {
       return { results: [], errors, agentsUsed };
@@ -448,25 +441,14 @@ export class OpensageCoordinator {
   }
 
   private inferTaskType(task: string): string {
-    const taskLower = task.toLowerCase();
+    let best = TASK_TYPE_KEYWORDS.length;
 
-    if (taskLower.includes("test") || taskLower.includes("verify")) {
-      return "testing";
-    }
-    if (taskLower.includes("optimize") || taskLower.includes("improve")) {
-      return "optimization";
-    }
-    if (taskLower.includes("implement") || taskLower.includes("create")) {
-      return "implementation";
-    }
-    if (taskLower.includes("review") || taskLower.includes("audit")) {
-      return "review";
-    }
-    if (taskLower.includes("design") || taskLower.includes("plan")) {
-      return "design";
+    for (const [, keyword] of task.toLowerCase().matchAll(TASK_TYPE_PATTERN)) {
+      best = Math.min(best, TASK_TYPE_RANK.get(keyword) ?? best);
+      if (best === 0) break;
     }
 
-    return "general";
+    return best < TASK_TYPE_KEYWORDS.length ? TASK_TYPE_KEYWORDS[best][0] : "general";
   }
 
   private estimateCost(agentCount: number, baseCost: number): number {
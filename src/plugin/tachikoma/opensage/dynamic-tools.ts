@@ -1,17 +1,9 @@
-import { constants, access, mkdir, writeFile } from "node:fs/promises";
+import { mkdir, unlink } from "node:fs/promises";
 import { readdir } from "node:fs/promises";
 import { join } from "node:path";
 import type { Plugin } from "@opencode-ai/plugin";
 import type { AsyncJob, ToolSpec } from "../../../types/opensage";
-
-async function fileExists(filePath: string): Promise<boolean> {
-  try {
-    await access(filePath, constants.F_OK);
-    return true;
-  } catch {
-    return false;
-  }
-}
+import { writeFileAtomic } from "../../../utils/file-utils";
 
 interface GenerateToolArgs {
   requirement: string;
@@ -68,8 +60,10 @@ export const DynamicToolsPlugin = async ({ client, worktree }: Parameters<Plugin
         },
         async execute(args: GenerateToolArgs, context: any) {
           const spec = await generateToolSpec(args, client, context);
-          const toolPath = await writeToolFile(spec, TOOLS_DIR);
-          await writeToolMetadata(spec, TOOLS_DIR);
+          const [toolPath] = await Promise.all([
+            writeToolFile(spec, TOOLS_DIR),
+            writeToolMetadata(spec, TOOLS_DIR),
+          ]);
           return `Generated tool: @${spec.name}. Available immediately.`;
         },
       },
@@ -146,7 +140,7 @@ export const DynamicToolsPlugin = async ({ client, worktree }: Parameters<Plugin
             startTime: new Date().toISOString(),
           };
 
-          await writeFile(jobPath, JSON.stringify(job, null, 2));
+          await Bun.write(jobPath, JSON.stringify(job));
 
           return {
             jobId,
@@ -253,7 +247,7 @@ export default tool({
 });
 `;
 
-  await writeFile(filePath, content);
+  await Bun.write(filePath, content);
 
   if (spec.dependencies && spec.dependencies.length > 0) {
     try {
@@ -275,22 +269,21 @@ async function writeToolMetadata(spec: ToolSpec, dir: string): Promise<void> {
     dependencies: spec.dependencies || [],
     createdAt: new Date().toISOString(),
   };
-  await writeFile(metaPath, JSON.stringify(metadata, null, 2));
+  await Bun.write(metaPath, JSON.stringify(metadata, null, 2));
 }
 
 async function listTools(dir: string): Promise<ToolSpec[]> {
   const tools: ToolSpec[] = [];
 
   try {
-    const files = await readdir(dir);
-    const metaFiles = files.filter((f) => f.endsWith(".json"));
-
-    for (const file of metaFiles) {
-      const metaPath = join(dir, file);
-      if (await fileExists(metaPath)) {
-        const meta = JSON.parse(await Bun.file(metaPath).text());
-        tools.push(meta);
-      }
+    // Dirent types come from the directory read itself, so regular files are
+    // picked out without a stat per entry.
+    const entries = await readdir(dir, { withFileTypes: true });
+
+    for (const entry of entries) {
+      if (!entry.isFile() || !entry.name.endsWith(".json")) continue;
+      const meta = JSON.parse(await Bun.file(join(dir, entry.name)).text());
+      tools.push(meta);
     }
   } catch (error) {
     console.error("Failed to list tools:", error);
@@ -317,12 +310,17 @@ async function executeGeneratedTool(
 async function loadToolState(stateId: string, dir: string): Promise<Record<string, any>> {
   const statePath = join(dir, `${stateId}.json`);
 
-  const exists = await fileExists(statePath);
-  if (!exists) {
-    throw new Error(`State ${stateId} not found`);
+  let text: string;
+  try {
+    text = await Bun.file(statePath).text();
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code === "ENOENT") {
+      throw new Error(`State ${stateId} not found`);
+    }
+    throw error;
   }
 
-  return JSON.parse(await Bun.file(statePath).text());
+  return JSON.parse(text);
 }
 
 async function saveToolState(
@@ -336,16 +334,20 @@ async function saveToolState(
     state,
     updatedAt: new Date().toISOString(),
   };
-  await writeFile(statePath, JSON.stringify(stateData, null, 2));
+  // Compact output: state can be large, and indenting grows it with every nesting level.
+  // Written atomically so an interrupted save never leaves a truncated state behind.
+  await writeFileAtomic(statePath, JSON.stringify(stateData));
 }
 
 async function deleteToolState(stateId: string, dir: string): Promise<void> {
   const statePath = join(dir, `${stateId}.json`);
 
-  const exists = await fileExists(statePath);
-  if (!exists) {
-    throw new Error(`State ${stateId} not found`);
+  try {
+    await unlink(statePath);
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code === "ENOENT") {
+      throw new Error(`State ${stateId} not found`);
+    }
+    throw error;
   }
-
-  await Bun.$`rm ${statePath}`;
 }
@@ -1,6 +1,7 @@
-import { mkdir, readFile, writeFile } from "node:fs/promises";
+import { mkdir, readFile } from "node:fs/promises";
 import { join } from "node:path";
 import type { Plugin } from "@opencode-ai/plugin";
+import { CONFIG } from "../../../constants/config";
 import type {
   MemoryEdge,
   MemoryGraph,
@@ -31,39 +32,218 @@ function hashString(str: string): number {
   return Math.abs(hash);
 }
 
+const EMBEDDING_DIMENSIONS = 384;
+
 async function generateEmbedding(text: string): Promise<number[]> {
   const words = text.toLowerCase().split(/\s+/);
-  const vector = new Array(384).fill(0);
+  const vector = new Float64Array(EMBEDDING_DIMENSIONS);
 
   for (const word of words) {
     const hash = hashString(word);
     for (let i = 0; i < 8; i++) {
-      vector[(hash + i * 47) % 384] += 1;
+      vector[(hash + i * 47) % EMBEDDING_DIMENSIONS] += 1;
+    }
+  }
+
+  let magSq = 0;
+  for (let i = 0; i < vector.length; i++) {
+    magSq += vector[i] * vector[i];
+  }
+  if (magSq > 0) {
+    const mag = Math.sqrt(magSq);
+    for (let i = 0; i < vector.length; i++) {
+      vector[i] /= mag;
+    }
+  }
+
+  // Plain array so embeddings serialize to JSON arrays.
+  return Array.from(vector);
+}
+
+/**
+ * Cosine similarity of one query against many vectors. The query magnitude is
+ * computed once; missing or zero vectors score 0. Scores come back as one flat
+ * column, index-aligned with `vectors`.
+ */
+function cosineSimilarities(
+  query: number[],
+  vectors: Array<ArrayLike<number> | undefined>,
+): Float64Array {
+  let queryMagSq = 0;
+  for (let i = 0; i < query.length; i++) {
+    queryMagSq += query[i] * query[i];
+  }
+  const queryMag = Math.sqrt(queryMagSq);
+
+  const scores = new Float64Array(vectors.length);
+  if (queryMag === 0) return scores;
+
+  for (let v = 0; v < vectors.length; v++) {
+    const vector = vectors[v];
+    if (!vector) continue;
+
+    let dot = 0;
+    let magSq = 0;
+    for (let i = 0; i < query.length; i++) {
+      dot += query[i] * vector[i];
+      magSq += vector[i] * vector[i];
+    }
+    if (magSq !== 0) scores[v] = dot / (queryMag * Math.sqrt(magSq));
+  }
+  return scores;
+}
+
+// embeddings.bin: u32 header length, JSON header `{ ids }`, padding to an
+// 8-byte boundary, then one float64 vector of EMBEDDING_DIMENSIONS per id.
+const EMBEDDINGS_HEADER_BYTES = 4;
+
+function vectorDataOffset(headerLength: number): number {
+  return Math.ceil((EMBEDDINGS_HEADER_BYTES + headerLength) / 8) * 8;
+}
+
+/**
+ * Packs embeddings into one buffer. Only the ids go through JSON; vectors are
+ * copied as raw float64s instead of being formatted as decimal text.
+ */
+export function encodeEmbeddings(embeddings: Record<string, ArrayLike<number>>): Uint8Array {
+  const ids = Object.keys(embeddings);
+  const header = new TextEncoder().encode(JSON.stringify({ ids }));
+  const dataOffset = vectorDataOffset(header.length);
+  const buffer = new ArrayBuffer(dataOffset + ids.length * EMBEDDING_DIMENSIONS * 8);
+
+  new DataView(buffer).setUint32(0, header.length, true);
+  new Uint8Array(buffer, EMBEDDINGS_HEADER_BYTES).set(header);
+  const vectors = new Float64Array(buffer, dataOffset);
+  for (let i = 0; i < ids.length; i++) {
+    vectors.set(embeddings[ids[i]], i * EMBEDDING_DIMENSIONS);
+  }
+  return new Uint8Array(buffer);
+}
+
+/** Inverse of encodeEmbeddings; vectors are views into `buffer`, not copies. */
+export function decodeEmbeddings(buffer: ArrayBuffer): Record<string, Float64Array> {
+  const headerLength = new DataView(buffer).getUint32(0, true);
+  const header = new Uint8Array(buffer, EMBEDDINGS_HEADER_BYTES, headerLength);
+  const { ids } = JSON.parse(new TextDecoder().decode(header)) as { ids: string[] };
+  const dataOffset = vectorDataOffset(headerLength);
+
+  const embeddings: Record<string, Float64Array> = {};
+  for (let i = 0; i < ids.length; i++) {
+    const byteOffset = dataOffset + i * EMBEDDING_DIMENSIONS * 8;
+    embeddings[ids[i]] = new Float64Array(buffer, byteOffset, EMBEDDING_DIMENSIONS);
+  }
+  return embeddings;
+}
+
+/**
+ * Indices of the `limit` highest scores above `threshold`, best first. Matches
+ * are binary-inserted into a bounded list rather than all sorted; equal scores
+ * keep index order, as a stable sort would.
+ */
+function topScoreIndices(scores: Float64Array, threshold: number, limit: number): number[] {
+  const top: number[] = [];
+
+  for (let i = 0; i < scores.length; i++) {
+    const score = scores[i];
+    if (score <= threshold) continue;
+
+    // First position whose score is strictly lower, so ties stay in index order.
+    let lo = 0;
+    let hi = top.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (scores[top[mid]] >= score) lo = mid + 1;
+      else hi = mid;
     }
+    if (lo >= limit) continue;
+
+    top.splice(lo, 0, i);
+    if (top.length > limit) top.pop();
   }
 
-  const mag = Math.sqrt(vector.reduce((sum, v) => sum + v * v, 0));
-  return mag === 0 ? vector : vector.map((v) => v / mag);
+  return top;
 }
 
-function cosineSimilarity(a: number[], b: number[]): number {
-  let dot = 0;
-  let magA = 0;
-  let magB = 0;
+/**
+ * Edges keyed by each endpoint, in original edge order, so neighbour lookups
+ * don't rescan the whole edge list.
+ */
+function buildAdjacency(edges: MemoryEdge[]): Map<string, MemoryEdge[]> {
+  const adjacency = new Map<string, MemoryEdge[]>();
+  const add = (id: string, edge: MemoryEdge) => {
+    const list = adjacency.get(id);
+    if (list) list.push(edge);
+    else adjacency.set(id, [edge]);
+  };
+
+  for (const edge of edges) {
+    add(edge.from, edge);
+    if (edge.to !== edge.from) add(edge.to, edge);
+  }
+  return adjacency;
+}
 
-  for (let i = 0; i < a.length; i++) {
-    dot += a[i] * b[i];
-    magA += a[i] * a[i];
-    magB += b[i] * b[i];
+/**
+ * Keep only the newest `max` event nodes. Events are appended in time order,
+ * so the oldest are the first ones in the list; other node types are kept.
+ */
+function trimEventNodes(graph: MemoryGraph, max: number): void {
+  let toDrop = -max;
+  for (const node of graph.nodes) {
+    if (node.type === "event") toDrop++;
   }
+  if (toDrop <= 0) return;
 
-  return dot / (Math.sqrt(magA) * Math.sqrt(magB));
+  graph.nodes = graph.nodes.filter((node) => {
+    if (node.type !== "event" || toDrop === 0) return true;
+    toDrop--;
+    return false;
+  });
+}
+
+const WORD_CHAR = /\w/;
+
+/**
+ * Fenced code blocks (```lang\n...```) found by walking the text with indexOf
+ * rather than running a regex over every line.
+ */
+function findCodeFences(text: string): Array<{ language: string; content: string }> {
+  const fences: Array<{ language: string; content: string }> = [];
+  let from = 0;
+
+  while (true) {
+    const open = text.indexOf("```", from);
+    if (open === -1) break;
+
+    let end = open + 3;
+    while (end < text.length && WORD_CHAR.test(text[end])) end++;
+    const close = text[end] === "\n" ? text.indexOf("```", end + 2) : -1;
+    if (close === -1) {
+      from = open + 1;
+      continue;
+    }
+
+    fences.push({ language: text.slice(open + 3, end), content: text.slice(end + 1, close) });
+    from = close + 3;
+  }
+
+  return fences;
+}
+
+/** Nodes by id; the first node wins on duplicate ids, as with a linear find(). */
+function indexNodesById(nodes: MemoryNode[]): Map<string, MemoryNode> {
+  const byId = new Map<string, MemoryNode>();
+  for (const node of nodes) {
+    if (!byId.has(node.id)) byId.set(node.id, node);
+  }
+  return byId;
 }
 
 export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>[0]) => {
   const MEMORY_DIR = join(worktree, ".opencode", "memory");
   const GRAPH_FILE = join(MEMORY_DIR, "graph.json");
-  const EMBEDDINGS_FILE = join(MEMORY_DIR, "embeddings.json");
+  const EMBEDDINGS_FILE = join(MEMORY_DIR, "embeddings.bin");
+  const LEGACY_EMBEDDINGS_FILE = join(MEMORY_DIR, "embeddings.json");
 
   await ensureDir(MEMORY_DIR);
 
@@ -73,31 +253,31 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
       return { nodes: [], edges: [] };
     }
     try {
-      const content = await file.text();
-      return JSON.parse(content) as MemoryGraph;
+      return (await file.json()) as MemoryGraph;
     } catch {
       return { nodes: [], edges: [] };
     }
   }
 
   async function saveGraph(graph: MemoryGraph): Promise<void> {
-    await writeFile(GRAPH_FILE, JSON.stringify(graph, null, 2));
+    await Bun.write(GRAPH_FILE, JSON.stringify(graph));
   }
 
-  async function loadEmbeddings(): Promise<Record<string, number[]>> {
-    const file = Bun.file(EMBEDDINGS_FILE);
-    if (!file.exists()) {
-      return {};
-    }
+  async function loadEmbeddings(): Promise<Record<string, ArrayLike<number>>> {
     try {
-      return JSON.parse(await file.text());
+      const file = Bun.file(EMBEDDINGS_FILE);
+      if (await file.exists()) {
+        return decodeEmbeddings(await file.arrayBuffer());
+      }
+      // Stores from before the binary format; the next save rewrites them as embeddings.bin.
+      return await Bun.file(LEGACY_EMBEDDINGS_FILE).json();
     } catch {
       return {};
     }
   }
 
-  async function saveEmbeddings(embeddings: Record<string, number[]>): Promise<void> {
-    await writeFile(EMBEDDINGS_FILE, JSON.stringify(embeddings, null, 2));
+  async function saveEmbeddings(embeddings: Record<string, ArrayLike<number>>): Promise<void> {
+    await Bun.write(EMBEDDINGS_FILE, encodeEmbeddings(embeddings));
   }
 
   return {
@@ -108,8 +288,11 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
     "tool.execute.after": async (input: any, output: any) => {
       if (input.agent && output.error) {
         const graph = await loadGraph();
+        // One clock read per event, shared by the id and every timestamp field.
+        const nowMs = Date.now();
+        const now = new Date(nowMs).toISOString();
         const eventNode: MemoryNode = {
-          id: `event_${Date.now()}_${input.tool}`,
+          id: `event_${nowMs}_${input.tool}`,
           type: "event",
           label: `Tool execution: ${input.tool}`,
           content: `Agent: ${input.agent}, Tool: ${input.tool}, Error: ${output.error}`,
@@ -117,12 +300,13 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
             agent: input.agent,
             tool: input.tool,
             error: output.error,
-            timestamp: new Date().toISOString(),
+            timestamp: now,
           },
-          createdAt: new Date().toISOString(),
-          updatedAt: new Date().toISOString(),
+          createdAt: now,
+          updatedAt: now,
         };
         graph.nodes.push(eventNode);
+        trimEventNodes(graph, CONFIG.OPENSAGE.MAX_EVENT_NODES);
         await saveGraph(graph);
       }
     },
@@ -131,6 +315,7 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
       const graph = await loadGraph();
       const now = Date.now();
       const oneHourAgo = now - 60 * 60 * 1000;
+      const nodeCount = graph.nodes.length;
 
       graph.nodes = graph.nodes.filter((n) => {
         const timestamp = new Date(n.createdAt).getTime();
@@ -140,7 +325,10 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
         return true;
       });
 
-      await saveGraph(graph);
+      // Nothing expired: the file on disk is already current.
+      if (graph.nodes.length !== nodeCount) {
+        await saveGraph(graph);
+      }
     },
 
     tool: {
@@ -156,25 +344,26 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
           metadata: { type: "object", optional: true },
         },
         async execute(args: any) {
+          const nowMs = Date.now();
+          const now = new Date(nowMs).toISOString();
           const node: MemoryNode = {
-            id: `node_${Date.now()}_${hashString(args.label + Date.now())}`,
+            id: `node_${nowMs}_${hashString(args.label + nowMs)}`,
             type: args.type,
             label: args.label,
             content: args.content,
             metadata: args.metadata || {},
-            createdAt: new Date().toISOString(),
-            updatedAt: new Date().toISOString(),
+            createdAt: now,
+            updatedAt: now,
           };
 
-          node.embedding = await generateEmbedding(args.label + " " + args.content);
+          // The vector lives only in embeddings.bin, not duplicated in graph.json.
+          const embedding = await generateEmbedding(args.label + " " + args.content);
 
-          const graph = await loadGraph();
+          // The two files are independent, so read and write them concurrently.
+          const [graph, embeddings] = await Promise.all([loadGraph(), loadEmbeddings()]);
           graph.nodes.push(node);
-          await saveGraph(graph);
-
-          const embeddings = await loadEmbeddings();
-          embeddings[node.id] = node.embedding;
-          await saveEmbeddings(embeddings);
+          embeddings[node.id] = embedding;
+          await Promise.all([saveGraph(graph), saveEmbeddings(embeddings)]);
 
           return `Added node: ${node.id} (${args.type}: ${args.label})`;
         },
@@ -221,37 +410,43 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
           maxResults: { type: "number", optional: true },
         },
         async execute(args: MemoryQuery) {
-          const queryEmbedding = await generateEmbedding(args.query);
           const graph = await loadGraph();
-          const embeddings = await loadEmbeddings();
           const mode = args.mode || "similarity";
+          const { nodeType } = args;
+          const adjacency = buildAdjacency(graph.edges);
 
           let results: MemoryQueryResult[] = [];
 
           if (mode === "similarity") {
-            results = graph.nodes
-              .filter((n) => !args.nodeType || n.type === args.nodeType)
-              .map((node) => ({
-                node,
-                similarity: embeddings[node.id]
-                  ? cosineSimilarity(queryEmbedding, embeddings[node.id])
-                  : 0,
-                relations: [],
-              }))
-              .filter((r) => r.similarity > 0.1)
-              .sort((a, b) => b.similarity - a.similarity)
-              .slice(0, args.maxResults || 10);
+            // Only this mode needs vectors, so the embedding work is skipped for the others.
+            const queryEmbedding = await generateEmbedding(args.query);
+            const embeddings = await loadEmbeddings();
+            const candidates = nodeType
+              ? graph.nodes.filter((n) => n.type === nodeType)
+              : graph.nodes;
+            const similarities = cosineSimilarities(
+              queryEmbedding,
+              candidates.map((node) => embeddings[node.id]),
+            );
+            // Rank candidate indices against the score column; result objects are
+            // only built for the nodes that are returned.
+            results = topScoreIndices(similarities, 0.1, args.maxResults || 10).map((i) => ({
+              node: candidates[i],
+              similarity: similarities[i],
+              relations: [],
+            }));
           } else if (mode === "pattern") {
+            const queryLower = args.query.toLowerCase();
+            const labelMatches = (n: MemoryNode) => n.label.toLowerCase().includes(queryLower);
+            // Pick the predicate once instead of re-testing nodeType for every node.
             const matchingNodes = graph.nodes.filter(
-              (n) =>
-                (!args.nodeType || n.type === args.nodeType) &&
-                n.label.toLowerCase().includes(args.query.toLowerCase()),
+              nodeType ? (n) => n.type === nodeType && labelMatches(n) : labelMatches,
             );
             results = matchingNodes.map((node) => ({ node, relations: [] }));
           } else if (mode === "traverse") {
-            const startNodes = graph.nodes.filter((n) =>
-              n.label.toLowerCase().includes(args.query.toLowerCase()),
-            );
+            const queryLower = args.query.toLowerCase();
+            const startNodes = graph.nodes.filter((n) => n.label.toLowerCase().includes(queryLower));
+            const nodesById = indexNodesById(graph.nodes);
             const visited = new Set<string>();
             const resultsMap = new Map<string, MemoryNode>();
 
@@ -260,21 +455,20 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
               const queue = [{ nodeId: startNode.id, depth: 0 }];
               const maxDepth = 2;
 
-              while (queue.length > 0) {
-                const { nodeId, depth } = queue.shift()!;
+              // Advance a head index rather than shift(), which is O(n) per dequeue.
+              for (let head = 0; head < queue.length; head++) {
+                const { nodeId, depth } = queue[head];
                 if (visited.has(nodeId) || depth > maxDepth) continue;
 
                 visited.add(nodeId);
-                const node = graph.nodes.find((n) => n.id === nodeId);
+                const node = nodesById.get(nodeId);
                 if (node) resultsMap.set(nodeId, node);
 
-                const neighbors = graph.edges
-                  .filter((e) => e.from === nodeId || e.to === nodeId)
-                  .map((e) => (e.from === nodeId ? e.to : e.from))
-                  .filter((id) => !visited.has(id));
-
-                for (const neighborId of neighbors) {
-                  queue.push({ nodeId: neighborId, depth: depth + 1 });
+                for (const e of adjacency.get(nodeId) ?? []) {
+                  const neighborId = e.from === nodeId ? e.to : e.from;
+                  if (!visited.has(neighborId)) {
+                    queue.push({ nodeId: neighborId, depth: depth + 1 });
+                  }
                 }
               }
             }
@@ -283,9 +477,7 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
           }
 
           for (const result of results) {
-            const relatedEdges = graph.edges.filter(
-              (e) => e.from === result.node.id || e.to === result.node.id,
-            );
+            const relatedEdges = adjacency.get(result.node.id) ?? [];
             result.relations = relatedEdges.map((e) =>
               e.from === result.node.id ? `→[${e.type}]→ ${e.to}` : `←[${e.type}]← ${e.from}`,
             );
@@ -312,18 +504,21 @@ export const GraphMemoryPlugin = async ({ client, worktree }: Parameters<Plugin>
 
           const { nodes, edges } = await extractEntitiesFromMessages(messages.data || [], session);
 
-          const graph = await loadGraph();
+          const [graph, embeddings] = await Promise.all([loadGraph(), loadEmbeddings()]);
           graph.nodes.push(...nodes);
           graph.edges.push(...edges);
-          await saveGraph(graph);
+          // graph.json is written while the embeddings are generated below, and
+          // only when the session actually contributed something to it.
+          const graphSaved = nodes.length > 0 || edges.length > 0 ? saveGraph(graph) : undefined;
 
+          // One read and one write of embeddings.bin for the whole batch.
+          let embedded = 0;
           for (const node of nodes) {
             if (node.embedding) continue;
-            node.embedding = await generateEmbedding(node.label + " " + node.content);
-            const embeddings = await loadEmbeddings();
-            embeddings[node.id] = node.embedding;
-            await saveEmbeddings(embeddings);
+            embeddings[node.id] = await generateEmbedding(node.label + " " + node.content);
+            embedded++;
           }
+          await Promise.all([graphSaved, embedded > 0 ? saveEmbeddings(embeddings) : undefined]);
 
           return `Compressed session ${args.sessionId} into ${nodes.length} nodes and ${edges.length} edges`;
         },
@@ -362,33 +557,31 @@ async function extractEntitiesFromMessages(
 ): Promise<{ nodes: MemoryNode[]; edges: MemoryEdge[] }> {
   const nodes: MemoryNode[] = [];
   const edges: MemoryEdge[] = [];
+  // Every node from one extraction shares a single timestamp.
+  const now = new Date().toISOString();
 
   for (const message of messages) {
     for (const part of message.parts) {
       if (part.type === "text") {
-        const lines = part.text.split("\n");
-        for (const line of lines) {
-          const match = line.match(/```(\w+)?\n([\s\S]+?)```/);
-          if (match) {
-            const language = match[1] || "unknown";
-            const content = match[2];
-            const nodeId = `code_${hashString(content.substring(0, 50))}`;
-
-            const node: MemoryNode = {
-              id: nodeId,
-              type: "code",
-              label: `${language} code snippet`,
-              content: content.substring(0, 200),
-              metadata: {
-                language,
-                fullContent: content.length > 200 ? content : undefined,
-              },
-              createdAt: new Date().toISOString(),
-              updatedAt: new Date().toISOString(),
-            };
-
-            nodes.push(node);
-          }
+        for (const fence of findCodeFences(part.text)) {
+          const language = fence.language || "unknown";
+          const content = fence.content;
+          const nodeId = `code_${hashString(content.substring(0, 50))}`;
+
+          const node: MemoryNode = {
+            id: nodeId,
+            type: "code",
+            label: `${language} code snippet`,
+            content: content.substring(0, 200),
+            metadata: {
+              language,
+              fullContent: content.length > 200 ? content : undefined,
+            },
+            createdAt: now,
+            updatedAt: now,
+          };
+
+          nodes.push(node);
         }
       }
     }
@@ -398,28 +591,27 @@ async function extractEntitiesFromMessages(
 }
 
 function extractSubgraph(graph: MemoryGraph, centerIdParam: string, radius: number): MemoryNode[] {
-  const centerNode = graph.nodes.find((n) => n.id === centerIdParam);
-  if (!centerNode) return [];
+  const nodesById = indexNodesById(graph.nodes);
+  if (!nodesById.has(centerIdParam)) return [];
 
+  const adjacency = buildAdjacency(graph.edges);
   const visited = new Set<string>();
   const result: MemoryNode[] = [];
   const queue: Array<{ nodeId: string; depth: number }> = [{ nodeId: centerIdParam, depth: 0 }];
 
-  while (queue.length > 0) {
-    const { nodeId, depth } = queue.shift()!;
+  for (let head = 0; head < queue.length; head++) {
+    const { nodeId, depth } = queue[head];
     if (visited.has(nodeId) || depth > radius) continue;
 
     visited.add(nodeId);
-    const node = graph.nodes.find((n) => n.id === nodeId);
+    const node = nodesById.get(nodeId);
     if (node) result.push(node);
 
-    const neighbors = graph.edges
-      .filter((e) => e.from === nodeId || e.to === nodeId)
-      .map((e) => (e.from === nodeId ? e.to : e.from))
-      .filter((id) => !visited.has(id));
-
-    for (const neighborId of neighbors) {
-      queue.push({ nodeId: neighborId, depth: depth + 1 });
+    for (const e of adjacency.get(nodeId) ?? []) {
+      const neighborId = e.from === nodeId ? e.to : e.from;
+      if (!visited.has(neighborId)) {
+        queue.push({ nodeId: neighborId, depth: depth + 1 });
+      }
     }
   }
 
@@ -2,6 +2,7 @@ import { mkdir, readdir } from "node:fs/promises";
 import { join } from "node:path";
 import type { Plugin } from "@opencode-ai/plugin";
 import type { AgentSpec, HorizontalEnsemble, VerticalDecomposition } from "../../../types/opensage";
+import { parseSimpleYaml } from "../../../utils/yaml-parser";
 
 interface GenerateAgentArgs {
   task: string;
@@ -260,6 +261,28 @@ mode: ${spec.mode}
   return filePath;
 }
 
+/** Text between the opening `---` line and the next `\n---`, or null without one. */
+function extractFrontmatter(content: string): string | null {
+  if (!content.startsWith("---\n")) return null;
+  const end = content.indexOf("\n---", 4);
+  return end === -1 ? null : content.slice(4, end);
+}
+
+// Agent frontmatter sits at the top of the file and is normally well under this size
+const FRONTMATTER_PROBE_BYTES = 4096;
+
+/** Frontmatter of an agent file, reading the whole file only when the head is not enough. */
+async function readFrontmatter(path: string): Promise<string | null> {
+  const file = Bun.file(path);
+  const head = await file.slice(0, FRONTMATTER_PROBE_BYTES).text();
+  if (!head.startsWith("---\n")) return null;
+
+  const frontmatter = extractFrontmatter(head);
+  if (frontmatter !== null || file.size <= FRONTMATTER_PROBE_BYTES) return frontmatter;
+
+  return extractFrontmatter(await file.text());
+}
+
 async function listAgents(dir: string): Promise<AgentSpec[]> {
   const agents: AgentSpec[] = [];
 
@@ -268,19 +291,15 @@ async function listAgents(dir: string): Promise<AgentSpec[]> {
 
     for (const file of files) {
       if (file.endsWith(".md")) {
-        const content = await Bun.file(join(dir, file)).text();
-        const frontmatterMatch = content.match(/^---\n([\s\S]+?)\n---/);
-        if (frontmatterMatch) {
-          const lines = frontmatterMatch[1].split("\n");
-          const description = lines.find((l) => l.startsWith("description:"))?.substring(13) || "";
-
-          const modeLine = lines.find((l) => l.startsWith("mode:"));
-          const mode = modeLine?.substring(6) || "subagent";
+        const frontmatterText = await readFrontmatter(join(dir, file));
+        if (frontmatterText !== null) {
+          const frontmatter = parseSimpleYaml(frontmatterText);
+          const { description, mode } = frontmatter;
 
           agents.push({
             name: file.slice(0, -3),
-            description,
-            mode: mode as "primary" | "subagent" | "all",
+            description: typeof description === "string" ? description : "",
+            mode: (typeof mode === "string" && mode ? mode : "subagent") as AgentSpec["mode"],
           });
         }
       }
@@ -2,7 +2,8 @@ import { join } from "node:path";
 
 import { CONFIG } from "../../constants/config";
 import { logger } from "../../utils/logger";
-import { estimateTokens } from "../../utils/token-estimator";
+import { escapeRegExp } from "../../utils/string-utils";
+import { LineTokenCounter, estimateTokens } from "../../utils/token-estimator";
 
 export interface Chunk {
   id: string;
@@ -92,13 +93,39 @@ const MARKDOWN_PATTERNS = [
   { pattern: /^---$/m, name: "hr" },
 ];
 
+// Leading keywords (text before a line's first space) that name their own boundary type
+const BOUNDARY_KEYWORDS: ReadonlySet<string> = new Set([
+  "function",
+  "class",
+  "interface",
+  "type",
+  "import",
+  "export",
+]);
+
+const SEMANTIC_BOUNDARY_SOURCES = [...CODE_PATTERNS, ...MARKDOWN_PATTERNS].map(
+  ({ pattern }) => `(?:${pattern.source})`,
+);
+
+// Configured boundaries (leading newline stripped) and both pattern tables,
+// fused into one alternation so each line is scanned in a single pass
+function compileBoundaryPattern(boundaries: string[]): RegExp {
+  const prefixes = boundaries.map((boundary) => `(?:^${escapeRegExp(boundary.replace("\n", ""))})`);
+  return new RegExp([...prefixes, ...SEMANTIC_BOUNDARY_SOURCES].join("|"), "m");
+}
+
 // RLM HANDLER CLASS
 
 export class RLMHandler {
   private config: RLMConfig;
+  private boundaryPattern: RegExp;
+  // Adaptive chunks keyed by content hash and length, oldest first, so entries
+  // don't pin the source text; cleared when the config changes
+  private chunkCache = new Map<string, Chunk[]>();
 
   constructor(config?: Partial<RLMConfig>) {
     this.config = { ...DEFAULT_CONFIG, ...config };
+    this.boundaryPattern = compileBoundaryPattern(this.config.semanticBoundaries);
   }
 
   /**
@@ -112,8 +139,6 @@ export class RLMHandler {
     context: string,
     options?: { model?: string; subagentPrompt?: string },
   ): Promise<RLMResult> {
-    const startTime = Date.now();
-
     const totalTokens = estimateTokens(context);
 
     if (totalTokens <= this.config.chunkSize) {
@@ -166,8 +191,26 @@ export class RLMHandler {
       return this.simpleChunking(content);
     }
 
-    const lines = content.split("\n");
-    return this.createChunks(lines);
+    const key = `${Bun.hash(content)}:${content.length}`;
+    const cached = this.chunkCache.get(key);
+    if (cached) {
+      // Re-insert so the entry counts as most recently used
+      this.chunkCache.delete(key);
+      this.chunkCache.set(key, cached);
+      return cached.map((chunk) => ({ ...chunk }));
+    }
+
+    const chunks = this.createChunks(content.split("\n"));
+
+    if (this.chunkCache.size >= CONFIG.RLM.CHUNK_CACHE_SIZE) {
+      const oldest = this.chunkCache.keys().next().value;
+      if (oldest !== undefined) {
+        this.chunkCache.delete(oldest);
+      }
+    }
+    this.chunkCache.set(key, chunks);
+
+    return chunks.map((chunk) => ({ ...chunk }));
   }
 
   private createChunks(lines: string[]): Chunk[] {
@@ -175,34 +218,55 @@ export class RLMHandler {
     let currentChunk: string[] = [];
     let currentStartLine = 1;
     let chunkId = 0;
+    // Tracks estimateTokens(currentChunk.join("\n")) without re-joining each line
+    const currentTokens = new LineTokenCounter();
 
     for (let i = 0; i < lines.length; i++) {
       const line = lines[i];
       const isBoundary = this.isSemanticBoundary(line, lines, i);
 
-      if (this.shouldSplitChunk(currentChunk, isBoundary)) {
-        chunks.push(this.createChunk(currentChunk, currentStartLine, i, chunkId++, line));
+      if (this.shouldSplitChunk(currentChunk, currentTokens.tokens, isBoundary)) {
+        chunks.push(
+          this.createChunk(
+            currentChunk,
+            currentTokens.tokens,
+            currentStartLine,
+            i,
+            chunkId++,
+            line,
+          ),
+        );
         currentChunk = [];
+        currentTokens.reset();
         currentStartLine = i + 1;
       }
 
       currentChunk.push(line);
+      currentTokens.add(line);
     }
 
     if (currentChunk.length > 0) {
-      chunks.push(this.createFinalChunk(currentChunk, currentStartLine, lines.length, chunkId));
+      chunks.push(
+        this.createFinalChunk(
+          currentChunk,
+          currentTokens.tokens,
+          currentStartLine,
+          lines.length,
+          chunkId,
+        ),
+      );
     }
 
     return chunks;
   }
 
-  private shouldSplitChunk(chunk: string[], isBoundary: boolean): boolean {
-    const currentTokens = estimateTokens(chunk.join("\n"));
+  private shouldSplitChunk(chunk: string[], currentTokens: number, isBoundary: boolean): boolean {
     return isBoundary && currentTokens > this.config.chunkSize / 2 && chunk.length > 0;
   }
 
   private createChunk(
     chunk: string[],
+    tokens: number,
     startLine: number,
     endLine: number,
     id: number,
@@ -213,18 +277,24 @@ export class RLMHandler {
       content: chunk.join("\n"),
       startLine,
       endLine,
-      tokens: estimateTokens(chunk.join("\n")),
+      tokens,
       boundary: this.detectBoundaryType(boundaryLine),
     };
   }
 
-  private createFinalChunk(chunk: string[], startLine: number, endLine: number, id: number): Chunk {
+  private createFinalChunk(
+    chunk: string[],
+    tokens: number,
+    startLine: number,
+    endLine: number,
+    id: number,
+  ): Chunk {
     return {
       id: `chunk_${id}`,
       content: chunk.join("\n"),
       startLine,
       endLine,
-      tokens: estimateTokens(chunk.join("\n")),
+      tokens,
       boundary: "end",
     };
   }
@@ -237,7 +307,9 @@ export class RLMHandler {
 
     const chunks: Chunk[] = [];
 
-    for (let i = 0; i < numChunks; i++) {
+    // Rounding linesPerChunk up can use up the lines before numChunks is reached;
+    // stop there rather than emitting empty trailing chunks.
+    for (let i = 0; i < numChunks && i * linesPerChunk < lines.length; i++) {
       const start = i * linesPerChunk;
       const end = Math.min(start + linesPerChunk, lines.length);
       const chunkContent = lines.slice(start, end).join("\n");
@@ -260,36 +332,17 @@ export class RLMHandler {
 
     if (!trimmed) return false;
 
-    for (const boundary of this.config.semanticBoundaries) {
-      if (trimmed.startsWith(boundary.replace("\n", ""))) {
-        return true;
-      }
-    }
-
-    for (const { pattern } of CODE_PATTERNS) {
-      if (pattern.test(trimmed)) {
-        return true;
-      }
-    }
-
-    for (const { pattern } of MARKDOWN_PATTERNS) {
-      if (pattern.test(trimmed)) {
-        return true;
-      }
-    }
-
-    return false;
+    return this.boundaryPattern.test(trimmed);
   }
 
   private detectBoundaryType(line: string): string {
     const trimmed = line.trim();
 
-    if (trimmed.startsWith("function ")) return "function";
-    if (trimmed.startsWith("class ")) return "class";
-    if (trimmed.startsWith("interface ")) return "interface";
-    if (trimmed.startsWith("type ")) return "type";
-    if (trimmed.startsWith("import ")) return "import";
-    if (trimmed.startsWith("export ")) return "export";
+    const space = trimmed.indexOf(" ");
+    if (space > 0) {
+      const keyword = trimmed.slice(0, space);
+      if (BOUNDARY_KEYWORDS.has(keyword)) return keyword;
+    }
     if (trimmed.startsWith("#")) return "heading";
     if (trimmed.startsWith("```")) return "codeblock";
 
@@ -419,6 +472,8 @@ export class RLMHandler {
 
   setConfig(config: Partial<RLMConfig>): void {
     this.config = { ...this.config, ...config };
+    this.boundaryPattern = compileBoundaryPattern(this.config.semanticBoundaries);
+    this.chunkCache.clear();
   }
 }
 
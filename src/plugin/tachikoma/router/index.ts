@@ -15,29 +15,50 @@ import { RouteConfigManager } from "./route-config";
 
 export class CostAwareRouter {
   private routes: Map<string, RouteConfig>;
-  private intentClassifier: IntentClassifier;
-  private patternMatcher: PatternMatcher;
+  // Built on first use from the current routes; cleared when routes change.
+  private classifier: IntentClassifier | null = null;
+  private matcher: PatternMatcher | null = null;
   private routeConfigManager: RouteConfigManager;
   private configPath: string;
   private initialized = false;
+  /** Shared by concurrent initialize() calls so routes are loaded once. */
+  private initializing: Promise<void> | null = null;
 
   constructor(configPath?: string) {
     this.configPath = configPath || resolveToConfig("config/intent-routes.yaml");
     this.routeConfigManager = new RouteConfigManager(this.configPath);
     this.routes = new Map();
-    this.intentClassifier = new IntentClassifier(this.routes);
-    this.patternMatcher = new PatternMatcher(this.routes);
   }
 
-  async initialize(): Promise<void> {
-    if (this.initialized) return;
+  initialize(): Promise<void> {
+    this.initializing ??= this.loadRoutes().catch((error) => {
+      this.initializing = null;
+      throw error;
+    });
+    return this.initializing;
+  }
 
+  private async loadRoutes(): Promise<void> {
     this.routes = await this.routeConfigManager.loadRoutes();
-    this.intentClassifier = new IntentClassifier(this.routes);
-    this.patternMatcher = new PatternMatcher(this.routes);
+    this.resetMatchers();
     this.initialized = true;
   }
 
+  private get intentClassifier(): IntentClassifier {
+    this.classifier ??= new IntentClassifier(this.routes);
+    return this.classifier;
+  }
+
+  private get patternMatcher(): PatternMatcher {
+    this.matcher ??= new PatternMatcher(this.routes);
+    return this.matcher;
+  }
+
+  private resetMatchers(): void {
+    this.classifier = null;
+    this.matcher = null;
+  }
+
   private ensureInitialized(): void {
     if (!this.initialized) {
       throw new Error("CostAwareRouter not initialized. Call initialize() first.");
@@ -107,6 +128,8 @@ export class CostAwareRouter {
 
   addRoute(name: string, config: RouteConfig): void {
     this.routeConfigManager.addRoute(this.routes, name, config);
+    // Matchers index routes at construction, so rebuild them to pick up the new one.
+    this.resetMatchers();
   }
 
   explainDecision(decision: RoutingDecision): string {
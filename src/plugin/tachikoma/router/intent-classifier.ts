@@ -9,27 +9,77 @@ import type {
   RouteConfig,
 } from "../../../types/router";
 import { logger } from "../../../utils/logger";
+import { escapeRegExp } from "../../../utils/string-utils";
+
+const SPECIFIC_INTENTS: ReadonlySet<string> = new Set([
+  "test",
+  "verify",
+  "debug",
+  "refactor",
+  "research",
+  "explain",
+]);
+
+// Indicators match at a word start, so inflections ("passwords", "rewriting") still count
+const VERY_HIGH_INDICATORS = /\b(?:refactor entire|migrate entire|rewrit|redesign)/;
+const MULTI_FILE_INDICATORS = /\b(?:and|also|multiple|all|entire|whole|full|system)/;
+const CROSS_DOMAIN_INDICATORS = /\b(?:with|using|integration|migrate|between)/;
+const HIGH_STAKES_INDICATORS = /\b(?:production|security|auth|payment|critical|password)/;
+const BUG_FIX_INDICATORS = /\b(?:bug|fix)/;
+
+const TOKEN_PATTERN = /[a-z0-9_]+/g;
+const SINGLE_TOKEN = /^[a-z0-9_]+$/;
+/** Keeps phrase matches at a word start, mirroring how tokens are split. */
+const WORD_START = "(?<![a-z0-9_])";
+
+function tokenize(lowerRequest: string): Set<string> {
+  return new Set(lowerRequest.match(TOKEN_PATTERN));
+}
 
 export class IntentClassifier {
-  constructor(private routes: Map<string, RouteConfig>) {}
+  /** Inverted index: lowercased keyword -> intents listing it. */
+  private keywordIntents = new Map<string, IntentType[]>();
+  /** Longest single-word keyword, bounding the token prefixes looked up. */
+  private maxWordKeywordLength = 0;
+  /** Multi-word and punctuated keywords, each matched where a word starts. */
+  private phrasePatterns: Array<{ keyword: string; pattern: RegExp }> = [];
+
+  constructor(private routes: Map<string, RouteConfig>) {
+    for (const [routeName, config] of routes.entries()) {
+      const intentType = routeName as IntentType;
+      for (const keyword of new Set(config.patterns.map((k) => k.toLowerCase()))) {
+        if (!keyword) continue;
+
+        const intents = this.keywordIntents.get(keyword);
+        if (intents) {
+          intents.push(intentType);
+        } else {
+          this.keywordIntents.set(keyword, [intentType]);
+        }
+        if (SINGLE_TOKEN.test(keyword)) {
+          this.maxWordKeywordLength = Math.max(this.maxWordKeywordLength, keyword.length);
+        } else if (!intents) {
+          const pattern = new RegExp(WORD_START + escapeRegExp(keyword));
+          this.phrasePatterns.push({ keyword, pattern });
+        }
+      }
+    }
+  }
 
   private getIntentKeywords(intent: IntentType): string[] {
     const route = this.routes.get(intent);
     return route?.patterns || [];
   }
 
-  private getIntentPriorityOrder(): IntentType[] {
-    return Array.from(this.routes.keys()) as IntentType[];
-  }
   classifyIntent(request: string): IntentClassification {
     const lowerRequest = request.toLowerCase();
     const words = lowerRequest.split(/\s+/);
 
-    const { bestIntent, bestScore } = this.scoreIntentType(lowerRequest);
+    const { counts, keywords } = this.matchKeywords(lowerRequest);
+    const { bestIntent, bestScore } = this.scoreIntentType(counts);
     const confidence = this.calculateConfidence(bestScore, bestIntent);
-    const complexity = this.determineComplexity(request, bestIntent, words);
+    const complexity = this.determineComplexity(lowerRequest, bestIntent, words);
     const requiresTools = this.requiresTools(bestIntent, complexity);
-    const keywords = this.extractKeywords(request);
 
     return {
       type: bestIntent,
@@ -40,35 +90,20 @@ export class IntentClassifier {
     };
   }
 
-  private scoreIntentType(lowerRequest: string): { bestIntent: IntentType; bestScore: number } {
-    const scores = {} as Record<IntentType, number>;
-
-    for (const [routeName, config] of this.routes.entries()) {
-      const intentType = routeName as IntentType;
-      scores[intentType] = 0;
-
-      for (const keyword of config.patterns) {
-        if (lowerRequest.includes(keyword.toLowerCase())) {
-          const isSpecificIntent = [
-            "test",
-            "verify",
-            "debug",
-            "refactor",
-            "research",
-            "explain",
-          ].includes(intentType);
-          const weight = isSpecificIntent ? 2 : 1;
-          scores[intentType] += weight;
-        }
-      }
-    }
-
-    const priorityOrder = this.getIntentPriorityOrder();
+  /** Highest-scoring intent; ties go to the earlier route in priority order. */
+  private scoreIntentType(counts: ReadonlyMap<IntentType, number>): {
+    bestIntent: IntentType;
+    bestScore: number;
+  } {
     let bestIntent: IntentType = "unknown";
     let bestScore = 0;
 
-    for (const intentType of priorityOrder) {
-      const score = scores[intentType];
+    for (const routeName of this.routes.keys()) {
+      const intentType = routeName as IntentType;
+      const matchCount = counts.get(intentType) ?? 0;
+      const weight = SPECIFIC_INTENTS.has(intentType) ? 2 : 1;
+      const score = matchCount * weight;
+
       if (score > bestScore) {
         bestScore = score;
         bestIntent = intentType;
@@ -78,6 +113,45 @@ export class IntentClassifier {
     return { bestIntent, bestScore };
   }
 
+  /**
+   * One pass over request tokens and phrases. A keyword matches when a word
+   * starts with it, so "debugging" and "crashes" still hit "debug" and
+   * "crash". Tallies distinct matches per intent via the index and collects
+   * each matched keyword once.
+   */
+  private matchKeywords(lowerRequest: string): {
+    counts: Map<IntentType, number>;
+    keywords: string[];
+  } {
+    const counts = new Map<IntentType, number>();
+    const keywords: string[] = [];
+    const matched = new Set<string>();
+    const record = (keyword: string) => {
+      const intents = this.keywordIntents.get(keyword);
+      if (!intents || matched.has(keyword)) return;
+
+      matched.add(keyword);
+      keywords.push(keyword);
+      for (const intentType of intents) {
+        counts.set(intentType, (counts.get(intentType) ?? 0) + 1);
+      }
+    };
+
+    for (const token of tokenize(lowerRequest)) {
+      const maxLength = Math.min(token.length, this.maxWordKeywordLength);
+      for (let length = 1; length <= maxLength; length++) {
+        record(token.slice(0, length));
+      }
+    }
+    for (const { keyword, pattern } of this.phrasePatterns) {
+      if (pattern.test(lowerRequest)) {
+        record(keyword);
+      }
+    }
+
+    return { counts, keywords };
+  }
+
   private calculateConfidence(bestScore: number, bestIntent: IntentType): number {
     const keywords = this.getIntentKeywords(bestIntent);
     const totalKeywords = keywords.length;
@@ -87,50 +161,17 @@ export class IntentClassifier {
   }
 
   private determineComplexity(
-    request: string,
+    lowerRequest: string,
     intent: IntentType,
     words: string[],
   ): ComplexityLevel {
-    const lowerRequest = request.toLowerCase();
     const tokenCount = words.length;
 
-    const isVeryHigh = this.hasIndicators(lowerRequest, [
-      "refactor entire",
-      "migrate entire",
-      "rewrite",
-      "redesign",
-    ]);
-
-    const hasMultiFile = this.hasIndicators(lowerRequest, [
-      "and",
-      "also",
-      "multiple",
-      "all",
-      "entire",
-      "whole",
-      "full",
-      "system",
-    ]);
-
-    const hasCrossDomain = this.hasIndicators(lowerRequest, [
-      "with",
-      "using",
-      "integration",
-      "migrate",
-      "between",
-    ]);
-
-    const hasHighStakes = this.hasIndicators(lowerRequest, [
-      "production",
-      "security",
-      "auth",
-      "payment",
-      "critical",
-      "password",
-    ]);
-
-    const isBugFix =
-      intent === "debug" || lowerRequest.includes("bug") || lowerRequest.includes("fix");
+    const isVeryHigh = VERY_HIGH_INDICATORS.test(lowerRequest);
+    const hasMultiFile = MULTI_FILE_INDICATORS.test(lowerRequest);
+    const hasCrossDomain = CROSS_DOMAIN_INDICATORS.test(lowerRequest);
+    const hasHighStakes = HIGH_STAKES_INDICATORS.test(lowerRequest);
+    const isBugFix = intent === "debug" || BUG_FIX_INDICATORS.test(lowerRequest);
 
     const hasComplexityIndicators = hasMultiFile || hasCrossDomain || hasHighStakes || isBugFix;
 
@@ -170,10 +211,6 @@ export class IntentClassifier {
     return "very_high";
   }
 
-  private hasIndicators(text: string, indicators: string[]): boolean {
-    return indicators.some((ind) => text.includes(ind));
-  }
-
   private requiresTools(intent: IntentType, complexity: ComplexityLevel): boolean {
     if (intent === "explain" || intent === "query") {
       return complexity === "low";
@@ -181,15 +218,6 @@ export class IntentClassifier {
     return true;
   }
 
-  private extractKeywords(request: string): string[] {
-    const lower = request.toLowerCase();
-    const allKeywords: string[] = [];
-    for (const config of this.routes.values()) {
-      allKeywords.push(...config.patterns);
-    }
-    return allKeywords.filter((keyword) => lower.includes(keyword.toLowerCase()));
-  }
-
   needsClarification(confidence: number): boolean {
     return confidence < CLARIFICATION_CONFIDENCE_THRESHOLD;
   }
@@ -1,44 +1,54 @@
 import type { RouteConfig, RouteMatch } from "../../../types/router";
 
-export class PatternMatcher {
-  constructor(private routes: Map<string, RouteConfig>) {}
+interface CompiledPattern {
+  routeName: string;
+  config: RouteConfig;
+  pattern: string;
+  /** Lowercased words longer than two characters; all must appear in the request. */
+  words: string[];
+  score: number;
+}
 
-  matchPattern(request: string): RouteMatch | null {
-    const lowerRequest = request.toLowerCase();
-    let bestMatch: RouteMatch | null = null;
-    let bestScore = 0;
+export class PatternMatcher {
+  private compiled: CompiledPattern[] = [];
 
-    for (const [routeName, config] of this.routes) {
+  constructor(private routes: Map<string, RouteConfig>) {
+    for (const [routeName, config] of routes) {
       for (const pattern of config.patterns) {
         const lowerPattern = pattern.toLowerCase();
-
-        const patternWords = lowerPattern.split(/\s+/);
-        let matchCount = 0;
-
-        for (const word of patternWords) {
-          if (word.length > 2 && lowerRequest.includes(word)) {
-            matchCount++;
-          }
+        const words = lowerPattern.split(/\s+/).filter((w) => w.length > 2);
+        if (words.length > 0) {
+          this.compiled.push({ routeName, config, pattern, words, score: lowerPattern.length });
         }
+      }
+    }
+  }
 
-        if (matchCount === patternWords.filter((w) => w.length > 2).length && matchCount > 0) {
-          const score = lowerPattern.length;
-
-          if (score > bestScore) {
-            bestScore = score;
-            bestMatch = {
-              route: routeName,
-              pattern,
-              confidence: config.confidenceThreshold,
-              skill: config.skill,
-              skillChain: config.skillChain,
-              strategy: config.strategy,
-            };
-          }
-        }
+  matchPattern(request: string): RouteMatch | null {
+    const lowerRequest = request.toLowerCase();
+    let bestMatch: CompiledPattern | null = null;
+
+    for (const candidate of this.compiled) {
+      if (
+        (!bestMatch || candidate.score > bestMatch.score) &&
+        candidate.words.every((word) => lowerRequest.includes(word))
+      ) {
+        bestMatch = candidate;
       }
     }
 
-    return bestMatch;
+    if (!bestMatch) {
+      return null;
+    }
+
+    const { routeName, config, pattern } = bestMatch;
+    return {
+      route: routeName,
+      pattern,
+      confidence: config.confidenceThreshold,
+      skill: config.skill,
+      skillChain: config.skillChain,
+      strategy: config.strategy,
+    };
   }
 }
@@ -1,21 +1,30 @@
-import { existsSync } from "node:fs";
+import { stat } from "node:fs/promises";
 import { STRATEGY_CONFIG } from "../../../constants/router";
 import { IntentRoutesSchema, type ValidatedRouteConfig } from "../../../schemas";
 import type { RouteConfig } from "../../../types/router";
 import { logger } from "../../../utils/logger";
 import { resolveToConfig } from "../../../utils/path";
-import { parseSimpleYaml } from "../../../utils/yaml-parser";
+
+/**
+ * Validated routes per config path, kept for the life of the process so
+ * repeat loads (new routers, re-initialization) skip file I/O and parsing.
+ */
+const frozenRoutes = new Map<string, ReadonlyArray<readonly [string, RouteConfig]>>();
 
 export class RouteConfigManager {
   constructor(private configPath: string) {}
 
   async loadRoutes(): Promise<Map<string, RouteConfig>> {
+    const cached = frozenRoutes.get(this.configPath);
+    if (cached) {
+      return new Map(cached);
+    }
+
     const routes = new Map<string, RouteConfig>();
 
-    if (existsSync(this.configPath)) {
+    if (await Bun.file(this.configPath).exists()) {
       try {
-        const content = await Bun.file(this.configPath).text();
-        const yaml = parseSimpleYaml(content);
+        const yaml = await this.readConfig();
 
         const validated = IntentRoutesSchema.parse(yaml);
 
@@ -38,9 +47,40 @@ export class RouteConfigManager {
       throw new Error(`No valid routes found in ${this.configPath}`);
     }
 
+    frozenRoutes.set(this.configPath, Object.freeze(Array.from(routes)));
     return routes;
   }
 
+  /** JSON sidecar holding the parsed YAML, reused while newer than the YAML. */
+  private get cachePath(): string {
+    return `${this.configPath.replace(/\.ya?ml$/, "")}.cache.json`;
+  }
+
+  private async readConfig(): Promise<unknown> {
+    const [configStat, cacheStat] = await Promise.all([
+      stat(this.configPath),
+      stat(this.cachePath).catch(() => null),
+    ]);
+
+    if (cacheStat && cacheStat.mtimeMs >= configStat.mtimeMs) {
+      try {
+        return await Bun.file(this.cachePath).json();
+      } catch (error) {
+        logger.debug(`Ignoring unreadable route cache: ${this.cachePath}`, String(error));
+      }
+    }
+
+    // Deferred so warm starts served from the sidecar never load the YAML parser.
+    const { parseSimpleYaml } = await import("../../../utils/yaml-parser");
+    const yaml = parseSimpleYaml(await Bun.file(this.configPath).text());
+    try {
+      await Bun.write(this.cachePath, JSON.stringify(yaml));
+    } catch (error) {
+      logger.debug(`Could not write route cache: ${this.cachePath}`, String(error));
+    }
+    return yaml;
+  }
+
   addRoute(routes: Map<string, RouteConfig>, name: string, config: RouteConfig): void {
     routes.set(name, config);
   }
@@ -45,6 +45,51 @@ export interface VerificationConfig {
   criticalDomains: string[];
 }
 
+/**
+ * Literal equivalent of `/first.*second/`: true when `second` appears after
+ * `first` on the same line. Avoids regex backtracking over long results.
+ */
+function followsOnSameLine(text: string, first: string, second: string): boolean {
+  let start = text.indexOf(first);
+  while (start !== -1) {
+    const hit = text.indexOf(second, start + first.length);
+    if (hit === -1) return false;
+    const lineEnd = text.indexOf("\n", start);
+    if (lineEnd === -1 || hit + second.length <= lineEnd) return true;
+    start = text.indexOf(first, lineEnd);
+  }
+  return false;
+}
+
+/** Unfinished-work markers; `$TODO` is listed so it matches before its bare `TODO`. */
+const WORK_MARKERS = /\$?TODO|FIXME|HACK|XXX/g;
+
+/**
+ * Single scan for the markers `reflect` checks. Any marker counts as
+ * incomplete; `$TODO`, FIXME and HACK also count as placeholder code.
+ */
+function scanWorkMarkers(text: string): { incomplete: boolean; placeholder: boolean } {
+  let incomplete = false;
+  for (const [marker] of text.matchAll(WORK_MARKERS)) {
+    incomplete = true;
+    if (marker !== "TODO" && marker !== "XXX") {
+      return { incomplete, placeholder: true };
+    }
+  }
+  return { incomplete, placeholder: false };
+}
+
+const CRITERION_SUGGESTIONS: Readonly<Record<string, string>> = {
+  has_code: "Add code implementation",
+  no_obvious_errors: "Check for syntax errors",
+  has_tests: "Add test cases",
+  has_assertions: "Add assertions to tests",
+  no_hardcoded_secrets: "Use environment variables for secrets",
+  input_validation: "Add input validation/sanitization",
+  has_auth: "Add authentication logic",
+  password_handling: "Use password hashing (bcrypt/argon)",
+};
+
 const CRITERIA_EXTRACTORS: Record<string, () => VerificationCriterion[]> = {
   default: () => [
     {
@@ -93,7 +138,7 @@ const CRITERIA_EXTRACTORS: Record<string, () => VerificationCriterion[]> = {
       id: "preserves_functionality",
       description: "Functionality preserved",
       weight: 1.0,
-      check: (r) => !/removed|deleted|broken/.test(r.toLowerCase()),
+      check: (r) => !/removed|deleted|broken/i.test(r),
     },
   ],
   bug_fix: () => [
@@ -110,7 +155,7 @@ const CRITERIA_EXTRACTORS: Record<string, () => VerificationCriterion[]> = {
       id: "no_new_errors",
       description: "No new errors introduced",
       weight: 1.0,
-      check: (r) => !/error|exception|failed|crash/.test(r.toLowerCase()),
+      check: (r) => !/error|exception|failed|crash/i.test(r),
     },
   ],
   security: () => [
@@ -132,7 +177,10 @@ const CRITERIA_EXTRACTORS: Record<string, () => VerificationCriterion[]> = {
       id: "has_endpoint",
       description: "Contains API endpoint definition",
       weight: 1.0,
-      check: (r) => /@.*route|@.*endpoint|GET|POST|PUT|DELETE/.test(r),
+      check: (r) =>
+        /GET|POST|PUT|DELETE/.test(r) ||
+        followsOnSameLine(r, "@", "route") ||
+        followsOnSameLine(r, "@", "endpoint"),
     },
     {
       id: "has_error_handling",
@@ -242,7 +290,9 @@ export class VerificationLoop {
 
     for (const criterion of criteria) {
       try {
-        const passedCheck = await criterion.check(result, context);
+        // Built-in checks are synchronous; only suspend for the ones that return a promise.
+        const outcome = criterion.check(result, context);
+        const passedCheck = outcome instanceof Promise ? await outcome : outcome;
 
         if (passedCheck) {
           passed++;
@@ -288,9 +338,13 @@ export class VerificationLoop {
     const changes: string[] = [];
     const revised = result;
 
-    const critical = issues.filter((i) => i.severity === "critical");
-    const major = issues.filter((i) => i.severity === "major");
-    const minor = issues.filter((i) => i.severity === "minor");
+    // One pass over the issues; minor ones are not part of the revision prompt.
+    const critical: VerificationIssue[] = [];
+    const major: VerificationIssue[] = [];
+    for (const issue of issues) {
+      if (issue.severity === "critical") critical.push(issue);
+      else if (issue.severity === "major") major.push(issue);
+    }
 
     const revisionParts: string[] = [];
 
@@ -331,11 +385,13 @@ export class VerificationLoop {
       issues.push("Result is a single block of text - consider formatting");
     }
 
-    if (/TODO|FIXME|HACK|XXX/.test(result)) {
+    const markers = scanWorkMarkers(result);
+
+    if (markers.incomplete) {
       issues.push("Contains TODO/FIXME comments - may be incomplete");
     }
 
-    if (/\$TODO|FIXME|HACK/.test(result)) {
+    if (markers.placeholder) {
       issues.push("Contains placeholder code");
     }
 
@@ -363,17 +419,7 @@ export class VerificationLoop {
   }
 
   private getSuggestion(criterionId: string): string | undefined {
-    const suggestions: Record<string, string> = {
-      has_code: "Add code implementation",
-      no_obvious_errors: "Check for syntax errors",
-      has_tests: "Add test cases",
-      has_assertions: "Add assertions to tests",
-      no_hardcoded_secrets: "Use environment variables for secrets",
-      input_validation: "Add input validation/sanitization",
-      has_auth: "Add authentication logic",
-      password_handling: "Use password hashing (bcrypt/argon)",
-    };
-    return suggestions[criterionId];
+    return CRITERION_SUGGESTIONS[criterionId];
   }
 
   private generateSelfCritique(request: string, result: string): string {
@@ -412,8 +458,11 @@ export class VerificationLoop {
     else if (result.length > CONFIG.VERIFICATION.LONG_RESULT_THRESHOLD)
       confidence += CONFIG.VERIFICATION.LONG_RESULT_BONUS;
 
-    if (/\n\n/.test(result)) confidence += 0.1;
-    if (/```[\s\S]*```/.test(result)) confidence += 0.1;
+    if (result.includes("\n\n")) confidence += 0.1;
+
+    // Two non-overlapping fences, found without a backtracking scan of the whole result
+    const fence = result.indexOf("```");
+    if (fence !== -1 && result.indexOf("```", fence + 3) !== -1) confidence += 0.1;
 
     return Math.min(Math.max(confidence, 0), 1);
   }
@@ -30,6 +30,8 @@ export interface EditResult {
   format: EditFormat;
   attempts: number;
   error?: string;
+  /** False when the failure would repeat in every format (e.g. not a match problem). */
+  retryable?: boolean;
 }
 
 export interface ModelSelection {
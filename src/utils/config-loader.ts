@@ -69,8 +69,9 @@ export async function loadJSONConfig<T = unknown>(
 }
 
 export function mergeConfigs<T>(...configs: Partial<T>[]): T {
-  return configs.reduce<T>(
-    (merged, config) => ({ ...merged, ...config }),
-    {} as T,
-  );
+  const merged = {} as T;
+  for (const config of configs) {
+    Object.assign(merged as object, config);
+  }
+  return merged;
 }
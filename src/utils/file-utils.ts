@@ -1,4 +1,4 @@
-import { constants, access, mkdir, readFile } from "node:fs/promises";
+import { constants, access, mkdir, open, readFile, rename, rm } from "node:fs/promises";
 
 export interface FileReadResult<T = string> {
   success: boolean;
@@ -62,3 +62,32 @@ export async function ensureDir(path: string): Promise<void> {
     }
   }
 }
+
+/** Distinguishes temp files of concurrent writes to one path in this process. */
+let atomicWriteCount = 0;
+
+/**
+ * Write a file so readers never see a partial result: the data goes to a
+ * sibling temp file, is fsynced, then renamed over the target. Concurrent
+ * writes to the same path each get their own temp file; the last rename wins.
+ */
+export async function writeFileAtomic(path: string, data: string): Promise<void> {
+  const tmpPath = `${path}.${process.pid}.${++atomicWriteCount}.tmp`;
+  const handle = await open(tmpPath, "w");
+  try {
+    await handle.writeFile(data, "utf-8");
+    await handle.sync();
+  } catch (error) {
+    await handle.close();
+    await rm(tmpPath, { force: true });
+    throw error;
+  }
+  await handle.close();
+
+  try {
+    await rename(tmpPath, path);
+  } catch (error) {
+    await rm(tmpPath, { force: true });
+    throw error;
+  }
+}
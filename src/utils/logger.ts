@@ -5,19 +5,37 @@ interface LoggerConfig {
   prefix?: string;
 }
 
+const LEVEL_RANK: Record<LogLevel, number> = {
+  debug: 0,
+  info: 1,
+  warn: 2,
+  error: 3,
+};
+
+const LEVEL_TAGS: Record<LogLevel, string> = {
+  debug: "[DEBUG]",
+  info: "[INFO]",
+  warn: "[WARN]",
+  error: "[ERROR]",
+};
+
 class Logger {
-  constructor(private config: LoggerConfig = { level: "info" }) {}
+  private minRank: number;
+  private prefix: string;
+
+  constructor(private config: LoggerConfig = { level: "info" }) {
+    this.minRank = LEVEL_RANK[config.level] ?? LEVEL_RANK.info;
+    this.prefix = config.prefix ? `[${config.prefix}] ` : "";
+  }
 
   private shouldLog(level: LogLevel): boolean {
-    const levels: LogLevel[] = ["debug", "info", "warn", "error"];
-    return levels.indexOf(level) >= levels.indexOf(this.config.level);
+    return LEVEL_RANK[level] >= this.minRank;
   }
 
   private format(level: LogLevel, message: string, data?: unknown): string {
-    const prefix = this.config.prefix ? `[${this.config.prefix}] ` : "";
     const timestamp = new Date().toISOString();
     const dataStr = data ? ` ${JSON.stringify(data)}` : "";
-    return `${timestamp} ${prefix}[${level.toUpperCase()}] ${message}${dataStr}`;
+    return `${timestamp} ${this.prefix}${LEVEL_TAGS[level]} ${message}${dataStr}`;
   }
 
   debug(message: string, data?: unknown): void {
@@ -5,7 +5,7 @@ export function memoize<T extends (...args: unknown[]) => unknown>(
     keyGenerator?: (...args: Parameters<T>) => string;
   },
 ): T {
-  const cache = new Map<string, { value: ReturnType<T>; timestamp: number }>();
+  const cache = new Map<string, { value: ReturnType<T> }>();
   const maxSize = options?.maxSize ?? 100;
 
   const getKey =
@@ -29,7 +29,7 @@ export function memoize<T extends (...args: unknown[]) => unknown>(
       }
     }
 
-    cache.set(key, { value: result, timestamp: Date.now() });
+    cache.set(key, { value: result });
     return result;
   }) as T;
 }
@@ -1,22 +1,85 @@
+import { isWhitespaceCode } from "./string-utils";
+
 export interface TokenEstimatorOptions {
   hasCode?: boolean;
 }
 
+const CODE_KEYWORDS = /function|class|import|export|const|let|var/;
+
+// Lookup table for the code punctuation {}[]()<>:=;,. by char code
+const IS_CODE_CHAR = new Uint8Array(128);
+for (const char of "{}[]()<>:=;,.") IS_CODE_CHAR[char.charCodeAt(0)] = 1;
+
+/**
+ * Whitespace-separated words and code punctuation, counted in one pass over
+ * the text. Words match `text.split(/\s+/).filter(Boolean).length`.
+ */
+export function countWordsAndCodeChars(text: string): { words: number; codeChars: number } {
+  let words = 0;
+  let codeChars = 0;
+  let inWord = false;
+
+  for (let i = 0; i < text.length; i++) {
+    const code = text.charCodeAt(i);
+    if (isWhitespaceCode(code)) {
+      inWord = false;
+      continue;
+    }
+    if (!inWord) {
+      inWord = true;
+      words++;
+    }
+    if (code < 128) codeChars += IS_CODE_CHAR[code];
+  }
+
+  return { words, codeChars };
+}
+
+function tokensFor(words: number, codePatterns: number, hasCode: boolean): number {
+  // Different ratios for code vs prose
+  const ratio = hasCode ? 0.6 : 0.75;
+
+  return Math.ceil(words / ratio) + Math.ceil(codePatterns * 0.5);
+}
+
 export function estimateTokens(
   text: string,
   options: TokenEstimatorOptions = {},
 ): number {
   if (!text) return 0;
 
-  const words = text.split(/\s+/).filter(Boolean).length;
-  const codePatterns = (text.match(/[{}\[\]()<>:=;,.]/g) || []).length;
-
   // Detect if text contains code automatically
-  const hasCode =
-    options.hasCode ?? /function|class|import|export|const|let|var/.test(text);
+  const hasCode = options.hasCode ?? CODE_KEYWORDS.test(text);
 
-  // Different ratios for code vs prose
-  const ratio = hasCode ? 0.6 : 0.75;
+  const { words, codeChars } = countWordsAndCodeChars(text);
+  return tokensFor(words, codeChars, hasCode);
+}
 
-  return Math.ceil(words / ratio) + Math.ceil(codePatterns * 0.5);
+/**
+ * Running estimate for text built up line by line.
+ *
+ * `tokens` equals estimateTokens() of the lines joined with "\n", without
+ * re-joining and re-scanning everything added so far.
+ */
+export class LineTokenCounter {
+  private words = 0;
+  private codePatterns = 0;
+  private hasCode = false;
+
+  add(line: string): void {
+    const { words, codeChars } = countWordsAndCodeChars(line);
+    this.words += words;
+    this.codePatterns += codeChars;
+    this.hasCode ||= CODE_KEYWORDS.test(line);
+  }
+
+  reset(): void {
+    this.words = 0;
+    this.codePatterns = 0;
+    this.hasCode = false;
+  }
+
+  get tokens(): number {
+    return tokensFor(this.words, this.codePatterns, this.hasCode);
+  }
 }
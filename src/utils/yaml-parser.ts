@@ -1,3 +1,4 @@
+import { stat } from "node:fs/promises";
 import type { z } from "zod";
 
 export interface ParseOptions {
@@ -16,21 +17,27 @@ export function parseSimpleYaml(
 ): YamlNode {
   const { trimValues = true, skipComments = true, commentChar = "#" } = options;
 
-  const lines = content.split("\n");
   const result: YamlNode = {};
   const stack: Array<{ node: YamlNode; indent: number }> = [
     { node: result, indent: 0 },
   ];
 
-  for (const line of lines) {
-    const trimmed = line.trim();
+  // Walk lines by offset rather than materialising a split() array.
+  let lineStart = 0;
+  while (lineStart <= content.length) {
+    let lineEnd = content.indexOf("\n", lineStart);
+    if (lineEnd === -1) lineEnd = content.length;
+    const line = content.slice(lineStart, lineEnd);
+    lineStart = lineEnd + 1;
+
+    const leading = line.trimStart();
+    const trimmed = leading.trimEnd();
 
     if (!trimmed || (skipComments && trimmed.startsWith(commentChar))) {
       continue;
     }
 
-    const indent = line.search(/\S|$/);
-    const current = stack[stack.length - 1];
+    const indent = line.length - leading.length;
 
     while (stack.length > 1 && indent <= stack[stack.length - 1].indent) {
       stack.pop();
@@ -43,13 +50,15 @@ export function parseSimpleYaml(
       const newSection: YamlNode = {};
       parent[sectionName] = newSection;
       stack.push({ node: newSection, indent });
-    } else if (trimmed.includes(":")) {
+    } else {
       const colonIndex = trimmed.indexOf(":");
+      if (colonIndex === -1) continue;
+
       const key = trimmed.slice(0, colonIndex).trim();
       let value = trimmed.slice(colonIndex + 1).trim();
 
       if (trimValues) {
-        value = value.replace(/^["']|["']$/g, "");
+        value = stripQuotes(value);
       }
 
       parent[key] = value;
@@ -59,6 +68,18 @@ export function parseSimpleYaml(
   return result;
 }
 
+function isQuote(char: string | undefined): boolean {
+  return char === '"' || char === "'";
+}
+
+/** Drops one leading and one trailing quote character, independently. */
+function stripQuotes(value: string): string {
+  const start = isQuote(value[0]) ? 1 : 0;
+  const end =
+    value.length > start && isQuote(value[value.length - 1]) ? value.length - 1 : value.length;
+  return start === 0 && end === value.length ? value : value.slice(start, end);
+}
+
 export function parseYamlWithSchema<T>(
   content: string,
   schema: z.ZodType<T>,
@@ -68,19 +89,38 @@ export function parseYamlWithSchema<T>(
   return schema.parse(parsed);
 }
 
+interface CachedYaml {
+  mtimeMs: number;
+  size: number;
+  node: YamlNode;
+}
+
+/** Parsed files keyed by path and parse options, valid while mtime and size match. */
+const yamlCache = new Map<string, CachedYaml>();
+
+async function parseYamlFileCached(path: string, options: ParseOptions): Promise<YamlNode> {
+  const { mtimeMs, size } = await stat(path);
+  const { trimValues = "", skipComments = "", commentChar = "" } = options;
+  const key = `${path}\0${trimValues}\0${skipComments}\0${commentChar}`;
+  const cached = yamlCache.get(key);
+
+  if (!cached || cached.mtimeMs !== mtimeMs || cached.size !== size) {
+    const node = parseSimpleYaml(await Bun.file(path).text(), options);
+    yamlCache.set(key, { mtimeMs, size, node });
+    return structuredClone(node);
+  }
+
+  return structuredClone(cached.node);
+}
+
 export async function loadYamlFile<T = YamlNode>(
   path: string,
   schema?: z.ZodType<T>,
   options: ParseOptions = {},
 ): Promise<T | null> {
   try {
-    const content = await Bun.file(path).text();
-
-    if (schema) {
-      return parseYamlWithSchema(content, schema, options);
-    }
-
-    return parseSimpleYaml(content, options) as T;
+    const parsed = await parseYamlFileCached(path, options);
+    return schema ? schema.parse(parsed) : (parsed as T);
   } catch (error) {
     console.error(`Failed to load YAML file: ${path}`, error);
     return null;
@@ -0,0 +1,81 @@
+#!/usr/bin/env bun
+/**
+ * Agent Registry Tests
+ *
+ * Metrics persistence: successes are batched behind the flush timer, while
+ * failures and explicit flushes write straight away.
+ */
+
+import { afterEach, beforeEach, describe, expect, it } from "bun:test";
+import fs from "node:fs/promises";
+import os from "node:os";
+import path from "node:path";
+import { CONFIG } from "../../src/constants/config";
+import { AgentRegistry } from "../../src/plugin/tachikoma/opensage/agent-registry";
+
+describe("AgentRegistry metrics persistence", () => {
+  let worktree: string;
+  let metricsFile: string;
+
+  beforeEach(async () => {
+    worktree = await fs.mkdtemp(path.join(os.tmpdir(), "tachikoma-agent-registry-"));
+    metricsFile = path.join(worktree, ".opencode", "agent-metrics.json");
+  });
+
+  afterEach(async () => {
+    await fs.rm(worktree, { recursive: true, force: true });
+  });
+
+  async function readMetrics(): Promise<{ agents: Array<Record<string, unknown>> }> {
+    return JSON.parse(await fs.readFile(metricsFile, "utf-8"));
+  }
+
+  it("buffers successes until flush()", async () => {
+    const registry = new AgentRegistry(worktree);
+    await registry.recordSuccess("coder", "code", 0.5, 100);
+
+    expect(await Bun.file(metricsFile).exists()).toBe(false);
+
+    await registry.flush();
+    const metrics = await readMetrics();
+    expect(metrics.agents).toHaveLength(1);
+    expect(metrics.agents[0]).toMatchObject({ name: "coder", successCount: 1 });
+  });
+
+  it("writes buffered successes once the flush timer fires", async () => {
+    const registry = new AgentRegistry(worktree);
+    await registry.recordSuccess("coder", "code", 0.5, 100);
+    await registry.recordSuccess("coder", "code", 0.5, 300);
+
+    await Bun.sleep(CONFIG.OPENSAGE.METRICS_FLUSH_MS + 250);
+
+    const metrics = await readMetrics();
+    expect(metrics.agents[0]).toMatchObject({ successCount: 2, avgLatency: 200 });
+  });
+
+  it("writes failures immediately, including pending successes", async () => {
+    const registry = new AgentRegistry(worktree);
+    await registry.recordSuccess("coder", "code", 0.5, 100);
+    await registry.recordFailure("coder", "code", "boom");
+
+    const metrics = await readMetrics();
+    expect(metrics.agents[0]).toMatchObject({ successCount: 1, failureCount: 1 });
+  });
+
+  it("survives overlapping failure writes", async () => {
+    const registry = new AgentRegistry(worktree);
+
+    await Promise.all(
+      ["a", "b", "c", "d"].map((name) => registry.recordFailure(name, "code", "boom")),
+    );
+
+    expect((await readMetrics()).agents).toHaveLength(4);
+  });
+
+  it("does not write when nothing is pending", async () => {
+    const registry = new AgentRegistry(worktree);
+    await registry.flush();
+
+    expect(await Bun.file(metricsFile).exists()).toBe(false);
+  });
+});
@@ -0,0 +1,61 @@
+#!/usr/bin/env bun
+/**
+ * Edit Format Selector Tests
+ *
+ * Model-to-format resolution: exact keys first, then the longest configured
+ * pattern contained in the model name.
+ */
+
+import { describe, expect, it } from "bun:test";
+import {
+  type FormatConfig,
+  findFormatMatch,
+  selectFormat,
+} from "../../src/plugin/tachikoma/edit-format-selector";
+
+const CONFIG: FormatConfig = {
+  formats: {
+    llama: "str_replace_fuzzy",
+    codellama: "hashline",
+    "gpt-4": "apply_patch",
+    "gpt-4o": "editblock",
+    claude: "str_replace",
+  },
+};
+
+describe("findFormatMatch", () => {
+  it("prefers an exact key", () => {
+    expect(findFormatMatch("GPT-4", CONFIG)).toBe("apply_patch");
+  });
+
+  it("picks the longest of overlapping patterns, not config order", () => {
+    expect(findFormatMatch("meta-llama/codellama-34b", CONFIG)).toBe("hashline");
+    expect(findFormatMatch("openai/gpt-4o-mini", CONFIG)).toBe("editblock");
+  });
+
+  it("picks the longest match even when a shorter one starts earlier", () => {
+    expect(findFormatMatch("llama-vs-codellama", CONFIG)).toBe("hashline");
+  });
+
+  it("falls back to a shorter pattern when the longer one is absent", () => {
+    expect(findFormatMatch("llama-3-70b", CONFIG)).toBe("str_replace_fuzzy");
+  });
+
+  it("treats regex metacharacters in patterns literally", () => {
+    expect(findFormatMatch("gpt-4x", { formats: { "gpt-4.": "apply_patch" } })).toBeNull();
+  });
+
+  it("returns null when nothing matches", () => {
+    expect(findFormatMatch("mistral-large", CONFIG)).toBeNull();
+    expect(findFormatMatch("constructor", CONFIG)).toBeNull();
+  });
+});
+
+describe("selectFormat", () => {
+  it("defaults to fuzzy matching for unknown models", () => {
+    expect(selectFormat("unknown", CONFIG)).toMatchObject({
+      format: "str_replace_fuzzy",
+      confidence: 0.5,
+    });
+  });
+});
@@ -0,0 +1,155 @@
+#!/usr/bin/env bun
+/**
+ * Graph Memory Tests
+ *
+ * embeddings.bin encoding, the legacy embeddings.json fallback, and what the
+ * memory tools persist to the memory directory.
+ */
+
+import { afterEach, beforeEach, describe, expect, it } from "bun:test";
+import fs from "node:fs/promises";
+import os from "node:os";
+import path from "node:path";
+import {
+  GraphMemoryPlugin,
+  decodeEmbeddings,
+  encodeEmbeddings,
+} from "../../src/plugin/tachikoma/opensage/graph-memory";
+
+const DIMENSIONS = 384;
+
+function vector(seed: number): number[] {
+  return Array.from({ length: DIMENSIONS }, (_, i) => Math.sin(seed * 1000 + i) / (i + 1));
+}
+
+function roundTrip(embeddings: Record<string, ArrayLike<number>>): Record<string, Float64Array> {
+  const bytes = encodeEmbeddings(embeddings);
+  return decodeEmbeddings(bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.length));
+}
+
+describe("embeddings encoding", () => {
+  it("round-trips ids in order and vectors bit for bit", () => {
+    const embeddings = {
+      node_1: vector(1),
+      "node ü 2": vector(2),
+      code_3: new Float64Array(vector(3)),
+    };
+
+    const decoded = roundTrip(embeddings);
+
+    expect(Object.keys(decoded)).toEqual(Object.keys(embeddings));
+    for (const [id, values] of Object.entries(embeddings)) {
+      expect(Array.from(decoded[id])).toEqual(Array.from(values));
+    }
+  });
+
+  it("round-trips an empty store", () => {
+    expect(roundTrip({})).toEqual({});
+  });
+
+  it("rejects a truncated file", () => {
+    const bytes = encodeEmbeddings({ node_1: vector(1) });
+    expect(() => decodeEmbeddings(bytes.buffer.slice(0, bytes.length - 8))).toThrow();
+  });
+});
+
+describe("GraphMemoryPlugin", () => {
+  let worktree: string;
+  let memoryDir: string;
+
+  beforeEach(async () => {
+    worktree = await fs.mkdtemp(path.join(os.tmpdir(), "tachikoma-graph-memory-"));
+    memoryDir = path.join(worktree, ".opencode", "memory");
+  });
+
+  afterEach(async () => {
+    await fs.rm(worktree, { recursive: true, force: true });
+  });
+
+  async function createPlugin(client: unknown = {}): Promise<any> {
+    return GraphMemoryPlugin({ client, worktree } as any);
+  }
+
+  async function readGraph(): Promise<{
+    nodes: Array<{ id: string; label: string; type: string; content: string }>;
+  }> {
+    return JSON.parse(await fs.readFile(path.join(memoryDir, "graph.json"), "utf-8"));
+  }
+
+  async function readEmbeddings(): Promise<Record<string, Float64Array>> {
+    const bytes = await fs.readFile(path.join(memoryDir, "embeddings.bin"));
+    return decodeEmbeddings(bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.length));
+  }
+
+  it("stores node vectors in embeddings.bin, not graph.json", async () => {
+    const plugin = await createPlugin();
+    await plugin.tool["memory-add-node"].execute({
+      type: "concept",
+      label: "binary search",
+      content: "halve the interval each step",
+    });
+
+    const graph = await readGraph();
+    const embeddings = await readEmbeddings();
+
+    expect(graph.nodes).toHaveLength(1);
+    expect(graph.nodes[0]).not.toHaveProperty("embedding");
+    expect(Object.keys(embeddings)).toEqual([graph.nodes[0].id]);
+    expect(embeddings[graph.nodes[0].id]).toHaveLength(DIMENSIONS);
+    expect(await Bun.file(path.join(memoryDir, "embeddings.json")).exists()).toBe(false);
+  });
+
+  it("reads a legacy embeddings.json and migrates it on the next save", async () => {
+    const plugin = await createPlugin();
+    await plugin.tool["memory-add-node"].execute({
+      type: "concept",
+      label: "binary search",
+      content: "halve the interval each step",
+    });
+    const [legacy] = (await readGraph()).nodes;
+    const legacyVector = Array.from((await readEmbeddings())[legacy.id]);
+
+    // Rewind the store to the pre-binary layout.
+    await fs.rm(path.join(memoryDir, "embeddings.bin"));
+    await Bun.write(
+      path.join(memoryDir, "embeddings.json"),
+      JSON.stringify({ [legacy.id]: legacyVector }),
+    );
+
+    const found = await plugin.tool["memory-query"].execute({
+      query: "binary search halve the interval each step",
+      mode: "similarity",
+    });
+    expect(found).toContain("**binary search**");
+
+    await plugin.tool["memory-add-node"].execute({
+      type: "concept",
+      label: "merge sort",
+      content: "split, sort halves, merge",
+    });
+
+    const migrated = await readEmbeddings();
+    expect(Object.keys(migrated)).toHaveLength(2);
+    expect(Array.from(migrated[legacy.id])).toEqual(legacyVector);
+  });
+
+  it("records fenced code from a session as code nodes", async () => {
+    const text =
+      "Here is the fix:\n```ts\nconst x = 1;\n```\n" + "and a shell step:\n```\nbun test\n```";
+    const client = {
+      session: {
+        get: async () => ({ data: {} }),
+        messages: async () => ({ data: [{ parts: [{ type: "text", text }] }] }),
+      },
+    };
+    const plugin = await createPlugin(client);
+
+    const summary = await plugin.tool["memory-compress-session"].execute({ sessionId: "s1" });
+
+    expect(summary).toContain("into 2 nodes");
+    const graph = await readGraph();
+    expect(graph.nodes.map((n) => n.label)).toEqual(["ts code snippet", "unknown code snippet"]);
+    expect(graph.nodes[0]).toMatchObject({ type: "code", content: "const x = 1;\n" });
+    expect(Object.keys(await readEmbeddings()).sort()).toEqual(graph.nodes.map((n) => n.id).sort());
+  });
+});
@@ -0,0 +1,138 @@
+#!/usr/bin/env bun
+/**
+ * Intent Classifier Tests
+ *
+ * Keyword matching against the real classifier: keywords hit any word that
+ * starts with them, phrases match at a word start, and every route is scored.
+ */
+
+import { describe, expect, it } from "bun:test";
+import { IntentClassifier } from "../../src/plugin/tachikoma/router/intent-classifier";
+import type { RouteConfig } from "../../src/types/router";
+
+function route(patterns: string[]): RouteConfig {
+  return { patterns, confidenceThreshold: 0.6, strategy: "single_skill" };
+}
+
+// Trimmed, hand-built routes loosely modelled on src/config/intent-routes.yaml.
+// Not a copy: "code" has no YAML counterpart, and the order is chosen for the tie-break test.
+const ROUTES = new Map<string, RouteConfig>([
+  [
+    "debug",
+    route([
+      "debug",
+      "fix bug",
+      "troubleshoot",
+      "error",
+      "crash",
+      "broken",
+      "not working",
+      "fails to",
+      "exception",
+    ]),
+  ],
+  ["verify", route(["verify", "validate", "check", "ensure", "confirm", "audit", "test that"])],
+  [
+    "test",
+    route([
+      "test",
+      "testing",
+      "spec",
+      "assert",
+      "write tests",
+      "add tests",
+      "create tests",
+      "unit test",
+      "integration test",
+    ]),
+  ],
+  [
+    "refactor",
+    route([
+      "refactor",
+      "improve",
+      "clean up",
+      "restructure",
+      "simplify",
+      "optimize code",
+      "better way",
+    ]),
+  ],
+  [
+    "code",
+    route(["implement", "create", "build", "add feature", "new", "develop", "make", "add"]),
+  ],
+]);
+
+describe("IntentClassifier", () => {
+  const classifier = new IntentClassifier(ROUTES);
+
+  describe("inflected keywords", () => {
+    it("routes crashes/errors/debugging to debug", () => {
+      const result = classifier.classifyIntent("the app crashes with errors while debugging");
+      expect(result.type).toBe("debug");
+      expect(result.keywords).toEqual(expect.arrayContaining(["crash", "error", "debug"]));
+    });
+
+    it("routes refactoring to refactor", () => {
+      expect(classifier.classifyIntent("refactoring the parser module").type).toBe("refactor");
+    });
+
+    it("routes tests to test", () => {
+      expect(classifier.classifyIntent("the tests keep timing out").type).toBe("test");
+    });
+
+    it("counts a keyword once however many words start with it", () => {
+      const result = classifier.classifyIntent("errors, more errors, error logs");
+      expect(result.keywords.filter((k) => k === "error")).toHaveLength(1);
+    });
+
+    it("does not match a keyword in the middle of a word", () => {
+      expect(classifier.classifyIntent("terror").type).toBe("unknown");
+    });
+  });
+
+  describe("phrases", () => {
+    it("matches multi-word keywords", () => {
+      const result = classifier.classifyIntent("please clean up this module");
+      expect(result.type).toBe("refactor");
+      expect(result.keywords).toContain("clean up");
+    });
+
+    it("matches a phrase followed by an inflection", () => {
+      expect(classifier.classifyIntent("write unit tests for the lexer").keywords).toContain(
+        "unit test",
+      );
+    });
+
+    it("requires a phrase to start at a word boundary", () => {
+      expect(classifier.classifyIntent("prefix bugs").keywords).not.toContain("fix bug");
+    });
+  });
+
+  describe("complexity indicators", () => {
+    it("treats inflected security keywords as high stakes", () => {
+      expect(classifier.classifyIntent("add authentication for passwords").complexity).toBe("high");
+      expect(classifier.classifyIntent("add a settings page").complexity).toBe("medium");
+    });
+
+    it("treats inflected rewrite keywords as very high", () => {
+      expect(classifier.classifyIntent("rewriting the parser").complexity).toBe("very_high");
+    });
+  });
+
+  describe("scoring", () => {
+    it("scores every route rather than stopping at an early strong match", () => {
+      const result = classifier.classifyIntent("verify validate check test testing spec assert");
+      expect(result.type).toBe("test");
+    });
+
+    it("breaks ties in route priority order", () => {
+      expect(classifier.classifyIntent("debug and verify").type).toBe("debug");
+    });
+
+    it("returns unknown when nothing matches", () => {
+      expect(classifier.classifyIntent("hello there").type).toBe("unknown");
+    });
+  });
+});
@@ -0,0 +1,77 @@
+#!/usr/bin/env bun
+/**
+ * Model Harness Tests
+ *
+ * Layered edit matching: formats are tried in order while the failure is a
+ * match miss (EditMatchError), and any other error stops the retries.
+ */
+
+import { describe, expect, it } from "bun:test";
+import { ModelHarness } from "../../src/plugin/tachikoma/model-harness";
+
+const CONTENT = "function foo() {\n    return 1;\n}\n";
+
+describe("ModelHarness.layeredMatch", () => {
+  it("stops after the first format that matches", () => {
+    const harness = new ModelHarness();
+    const result = harness.layeredMatch(CONTENT, {
+      oldString: "return 1;",
+      newString: "return 2;",
+    });
+
+    expect(result.success).toBe(true);
+    expect(result.format).toBe("str_replace");
+    expect(result.attempts).toBe(1);
+    expect(result.content).toContain("return 2;");
+  });
+
+  it("falls through to fuzzy matching after an exact miss", () => {
+    const harness = new ModelHarness();
+    const result = harness.layeredMatch(CONTENT, {
+      oldString: "function foo() {\n  return 1;\n}",
+      newString: "function foo() {\n  return 2;\n}",
+    });
+
+    expect(result.success).toBe(true);
+    expect(result.format).toBe("str_replace_fuzzy");
+    expect(result.attempts).toBe(2);
+    expect(result.content).toContain("return 2;");
+  });
+
+  it("reports a failure when no format matches", () => {
+    const harness = new ModelHarness();
+    const result = harness.layeredMatch(CONTENT, {
+      oldString: "const missing = true;",
+      newString: "return 2;",
+    });
+
+    expect(result.success).toBe(false);
+    expect(result.retryable).toBe(false);
+    expect(result.content).toBe(CONTENT);
+  });
+
+  it("does not retry other formats after a non-match error", () => {
+    const tried: string[] = [];
+    class FailingHarness extends ModelHarness {
+      str_replace(): string {
+        tried.push("str_replace");
+        throw new TypeError("unexpected input");
+      }
+      str_replace_fuzzy(content: string, oldString: string, newString: string): string {
+        tried.push("str_replace_fuzzy");
+        return super.str_replace_fuzzy(content, oldString, newString);
+      }
+    }
+
+    const result = new FailingHarness().layeredMatch(CONTENT, {
+      oldString: "return 1;",
+      newString: "return 2;",
+    });
+
+    expect(tried).toEqual(["str_replace"]);
+    expect(result.success).toBe(false);
+    expect(result.retryable).toBe(false);
+    expect(result.attempts).toBe(1);
+    expect(result.error).toBe("unexpected input");
+  });
+});
@@ -0,0 +1,54 @@
+#!/usr/bin/env bun
+/**
+ * RLM Handler Tests
+ *
+ * Adaptive chunk cache: repeat calls reuse the split, callers get their own
+ * chunk objects, and config changes invalidate the cache.
+ */
+
+import { describe, expect, it } from "bun:test";
+import { RLMHandler } from "../../src/plugin/tachikoma/rlm-handler";
+
+const TEXT = "The quick brown fox jumps over the lazy dog again and again ".repeat(3);
+const DOC = ["# Notes", "## Alpha", TEXT, "## Beta", TEXT, "## Gamma", TEXT].join("\n");
+
+describe("RLMHandler chunk cache", () => {
+  it("returns the same split for repeated content", () => {
+    const handler = new RLMHandler({ chunkSize: 20 });
+    const first = handler.adaptiveChunking(DOC);
+    const second = handler.adaptiveChunking(DOC);
+
+    expect(first.length).toBeGreaterThan(1);
+    expect(second).toEqual(first);
+  });
+
+  it("hands out fresh chunk objects on a cache hit", () => {
+    const handler = new RLMHandler({ chunkSize: 20 });
+    const first = handler.adaptiveChunking(DOC);
+    const snapshot = first.map((chunk) => ({ ...chunk }));
+
+    first[0].content = "mutated";
+    first.pop();
+    const second = handler.adaptiveChunking(DOC);
+
+    expect(second[0]).not.toBe(first[0]);
+    expect(second).toEqual(snapshot);
+  });
+
+  it("distinguishes different content of the same length", () => {
+    const handler = new RLMHandler({ chunkSize: 20 });
+    const other = DOC.replace("Alpha", "Omega");
+
+    expect(other.length).toBe(DOC.length);
+    expect(handler.adaptiveChunking(DOC)[0].content).toContain("Alpha");
+    expect(handler.adaptiveChunking(other)[0].content).toContain("Omega");
+  });
+
+  it("re-chunks after the config changes", () => {
+    const handler = new RLMHandler({ chunkSize: 20 });
+    expect(handler.adaptiveChunking(DOC).length).toBeGreaterThan(1);
+
+    handler.setConfig({ chunkSize: 1_000_000 });
+    expect(handler.adaptiveChunking(DOC)).toHaveLength(1);
+  });
+});
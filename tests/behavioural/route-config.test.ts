@@ -0,0 +1,97 @@
+#!/usr/bin/env bun
+/**
+ * Route Config Tests
+ *
+ * The parsed-YAML JSON sidecar: used while it is at least as new as the YAML,
+ * rewritten when stale or unreadable, and validated routes are kept per path.
+ */
+
+import { afterEach, beforeEach, describe, expect, it } from "bun:test";
+import fs from "node:fs/promises";
+import os from "node:os";
+import path from "node:path";
+import { RouteConfigManager } from "../../src/plugin/tachikoma/router/route-config";
+
+const SIDECAR_ROUTES = {
+  routes: [{ patterns: ["debug"], confidenceThreshold: 0.7, strategy: "single_skill" }],
+};
+
+describe("RouteConfigManager sidecar cache", () => {
+  let dir: string;
+  let configPath: string;
+  let cachePath: string;
+
+  beforeEach(async () => {
+    // A fresh path per test, since validated routes are kept per path for the process.
+    dir = await fs.mkdtemp(path.join(os.tmpdir(), "tachikoma-routes-"));
+    configPath = path.join(dir, "intent-routes.yaml");
+    cachePath = path.join(dir, "intent-routes.cache.json");
+    await fs.writeFile(configPath, "version: 2\nowner: tests\n");
+  });
+
+  afterEach(async () => {
+    await fs.rm(dir, { recursive: true, force: true });
+  });
+
+  async function setMtime(file: string, offsetMs: number): Promise<void> {
+    const when = new Date(Date.now() + offsetMs);
+    await fs.utimes(file, when, when);
+  }
+
+  async function loadIgnoringValidation(manager: RouteConfigManager): Promise<void> {
+    // The YAML here holds no routes, so validation fails; only the sidecar is under test.
+    await manager.loadRoutes().catch(() => undefined);
+  }
+
+  it("writes the parsed YAML to the sidecar", async () => {
+    await loadIgnoringValidation(new RouteConfigManager(configPath));
+
+    expect(JSON.parse(await fs.readFile(cachePath, "utf-8"))).toEqual({
+      version: "2",
+      owner: "tests",
+    });
+  });
+
+  it("serves routes from a sidecar newer than the YAML", async () => {
+    await fs.writeFile(cachePath, JSON.stringify(SIDECAR_ROUTES));
+    await setMtime(cachePath, 60_000);
+
+    const routes = await new RouteConfigManager(configPath).loadRoutes();
+
+    expect(Array.from(routes.values())).toEqual(SIDECAR_ROUTES.routes);
+  });
+
+  it("re-parses the YAML when the sidecar is older", async () => {
+    await fs.writeFile(cachePath, JSON.stringify(SIDECAR_ROUTES));
+    await setMtime(cachePath, -60_000);
+
+    await loadIgnoringValidation(new RouteConfigManager(configPath));
+
+    expect(JSON.parse(await fs.readFile(cachePath, "utf-8"))).toEqual({
+      version: "2",
+      owner: "tests",
+    });
+  });
+
+  it("re-parses the YAML when the sidecar is unreadable", async () => {
+    await fs.writeFile(cachePath, "{ not json");
+    await setMtime(cachePath, 60_000);
+
+    await loadIgnoringValidation(new RouteConfigManager(configPath));
+
+    expect(JSON.parse(await fs.readFile(cachePath, "utf-8"))).toMatchObject({ owner: "tests" });
+  });
+
+  it("keeps validated routes for the path without re-reading files", async () => {
+    await fs.writeFile(cachePath, JSON.stringify(SIDECAR_ROUTES));
+    await setMtime(cachePath, 60_000);
+    const first = await new RouteConfigManager(configPath).loadRoutes();
+
+    await fs.rm(configPath);
+    await fs.rm(cachePath);
+    const second = await new RouteConfigManager(configPath).loadRoutes();
+
+    expect(second).toEqual(first);
+    expect(second).not.toBe(first);
+  });
+});
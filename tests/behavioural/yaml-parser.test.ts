@@ -0,0 +1,69 @@
+#!/usr/bin/env bun
+/**
+ * YAML Parser Tests
+ *
+ * loadYamlFile caching: parsed files are reused while mtime and size match,
+ * and every caller gets its own copy of the result.
+ */
+
+import { afterEach, beforeEach, describe, expect, it } from "bun:test";
+import fs from "node:fs/promises";
+import os from "node:os";
+import path from "node:path";
+import { type YamlNode, loadYamlFile } from "../../src/utils/yaml-parser";
+
+describe("loadYamlFile cache", () => {
+  let dir: string;
+  let file: string;
+
+  beforeEach(async () => {
+    dir = await fs.mkdtemp(path.join(os.tmpdir(), "tachikoma-yaml-"));
+    file = path.join(dir, "config.yaml");
+    await fs.writeFile(file, "name: alpha\nsection:\n  key: one\n");
+  });
+
+  afterEach(async () => {
+    await fs.rm(dir, { recursive: true, force: true });
+  });
+
+  it("parses the file", async () => {
+    expect(await loadYamlFile(file)).toEqual({ name: "alpha", section: { key: "one" } });
+  });
+
+  it("hands each caller an independent copy", async () => {
+    const first = (await loadYamlFile<YamlNode>(file)) as YamlNode;
+    first.name = "changed";
+    (first.section as YamlNode).key = "changed";
+
+    expect(await loadYamlFile(file)).toEqual({ name: "alpha", section: { key: "one" } });
+  });
+
+  it("re-parses after the file changes size", async () => {
+    await loadYamlFile(file);
+    await fs.writeFile(file, "name: a-longer-value\n");
+
+    expect(await loadYamlFile(file)).toEqual({ name: "a-longer-value" });
+  });
+
+  it("re-parses after a same-size rewrite with a new mtime", async () => {
+    await loadYamlFile(file);
+    await fs.writeFile(file, "name: bravo\nsection:\n  key: two\n");
+    const later = new Date(Date.now() + 60_000);
+    await fs.utimes(file, later, later);
+
+    expect(await loadYamlFile(file)).toEqual({ name: "bravo", section: { key: "two" } });
+  });
+
+  it("caches per parse options", async () => {
+    await fs.writeFile(file, "name: 'quoted'\n");
+
+    expect(await loadYamlFile(file)).toEqual({ name: "quoted" });
+    expect(await loadYamlFile(file, undefined, { trimValues: false })).toEqual({
+      name: "'quoted'",
+    });
+  });
+
+  it("returns null for a missing file", async () => {
+    expect(await loadYamlFile(path.join(dir, "missing.yaml"))).toBeNull();
+  });
+});
@@ -0,0 +1,51 @@
+#!/usr/bin/env bun
+/**
+ * File Utils Tests
+ *
+ * writeFileAtomic: replaces the target in one step and tolerates concurrent
+ * writers to the same path.
+ */
+
+import { afterEach, beforeEach, describe, expect, it } from "bun:test";
+import fs from "node:fs/promises";
+import os from "node:os";
+import path from "node:path";
+import { writeFileAtomic } from "../../src/utils/file-utils";
+
+describe("writeFileAtomic", () => {
+  let dir: string;
+
+  beforeEach(async () => {
+    dir = await fs.mkdtemp(path.join(os.tmpdir(), "tachikoma-file-utils-"));
+  });
+
+  afterEach(async () => {
+    await fs.rm(dir, { recursive: true, force: true });
+  });
+
+  it("writes the data and leaves no temp file behind", async () => {
+    const target = path.join(dir, "metrics.json");
+    await writeFileAtomic(target, '{"a":1}');
+
+    expect(await fs.readFile(target, "utf-8")).toBe('{"a":1}');
+    expect(await fs.readdir(dir)).toEqual(["metrics.json"]);
+  });
+
+  it("replaces an existing file", async () => {
+    const target = path.join(dir, "metrics.json");
+    await fs.writeFile(target, "old");
+    await writeFileAtomic(target, "new");
+
+    expect(await fs.readFile(target, "utf-8")).toBe("new");
+  });
+
+  it("does not fail when writes to one path overlap", async () => {
+    const target = path.join(dir, "metrics.json");
+    const payloads = Array.from({ length: 8 }, (_, i) => JSON.stringify({ write: i }));
+
+    await Promise.all(payloads.map((data) => writeFileAtomic(target, data)));
+
+    expect(payloads).toContain(await fs.readFile(target, "utf-8"));
+    expect(await fs.readdir(dir)).toEqual(["metrics.json"]);
+  });
+});